@@ -0,0 +1,26 @@
+#region classes
+class Capacitor():
+    #region constructor
+    def __init__(self, C=1.0e-6, name='ab'):
+        """
+        Defines a capacitor to have a self.Capacitance and self.Name.  Capacitors only take part in AC analysis,
+        they are open circuits for DC.
+        :param C: capacitance in Farad (float)
+        :param name: name of capacitor by alphabetically ordered pair of node names
+        """
+        #region attributes
+        self.Capacitance = C  # Set the capacitance of the capacitor
+        self.Name = name      # Set the name of the capacitor
+        #endregion
+    #endregion
+
+    #region methods
+    def Admittance(self, omega):
+        """
+        Calculates the complex admittance of the capacitor.
+        :param omega: angular frequency in rad/s (float or array)
+        :return: j*omega*C
+        """
+        return 1j * omega * self.Capacitance
+    #endregion
+#endregion
\ No newline at end of file
@@ -0,0 +1,58 @@
+#region imports
+import numpy as np
+from Resistor import Resistor
+#endregion
+
+#region classes
+class Diode(Resistor):
+    #region constructor
+    def __init__(self, Is=1.0e-12, n=1.0, name='ab', Vt=0.025852):
+        """
+        A diode following the Shockley equation I = Is*(exp(V/(n*Vt)) - 1), conducting from its first (anode) to
+        its second (cathode) node.  It is a nonlinear resistor, so networks containing diodes are solved by
+        Newton's method with the analytic conductance dI/dV.
+        :param Is: saturation current in amps (float)
+        :param n: ideality factor (float)
+        :param name: name of diode by ordered pair of node names, anode first
+        :param Vt: thermal voltage in volts (float)
+        """
+        #region attributes
+        self.Is = Is  # saturation current
+        self.n = n  # ideality factor
+        self.Vt = Vt  # thermal voltage
+        self.VMax = 40.0 * n * Vt  # beyond this the exponential is continued linearly to avoid overflow
+        self.V = 0.0  # voltage drop, set by the solver
+        super().__init__(R=np.inf, name=name)
+        self.IsLinear = False
+        #endregion
+    #endregion
+
+    #region methods
+    def DeltaV(self):
+        """
+        The voltage drop across a diode is stored by the solver, it does not follow from Ohm's law.
+        :return: voltage drop across the diode as a float
+        """
+        return self.V
+
+    def GetCurrent(self, v):
+        """
+        Shockley diode current, continued linearly above self.VMax.
+        :param v: voltage drop from anode to cathode (float or array)
+        :return: the diode current
+        """
+        nVt = self.n * self.Vt
+        vc = np.minimum(v, self.VMax)
+        e = np.exp(vc / nVt)
+        return self.Is * (e * (1.0 + (v - vc) / nVt) - 1.0)
+
+    def GetConductance(self, v):
+        """
+        Analytic derivative of GetCurrent.
+        :param v: voltage drop from anode to cathode (float or array)
+        :return: dI/dV
+        """
+        nVt = self.n * self.Vt
+        return self.Is / nVt * np.exp(np.minimum(v, self.VMax) / nVt)
+    #endregion
+#endregion
\ No newline at end of file
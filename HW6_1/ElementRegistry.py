@@ -0,0 +1,56 @@
+#region class definitions
+class ElementRegistry():
+    #region constructor
+    def __init__(self):
+        """
+        A hash index of the elements of a network keyed by the unordered pair of nodes they connect.  Each entry
+        records the kind of element ('R' for resistor, 'V' for voltage source), its index in the network's list
+        for that kind and the node pair in the element's own orientation, so a lookup from either direction
+        returns the element in O(1) together with the sign of the traversal.
+        """
+        #region attributes
+        self.Entries = {}  # (node, node) sorted tuple -> list of (kind, index, first node, second node)
+        self.Count = 0  # number of elements registered
+        #endregion
+    #endregion
+
+    #region methods
+    @staticmethod
+    def Key(n1, n2):
+        """
+        The canonical (unordered) key for a pair of nodes.
+        :param n1: name of one node
+        :param n2: name of the other node
+        :return: a tuple of the two node names in sorted order
+        """
+        return (n1, n2) if n1 <= n2 else (n2, n1)
+
+    def Add(self, n1, n2, kind, index):
+        """
+        Registers an element.
+        :param n1: first node of the element
+        :param n2: second node of the element
+        :param kind: 'R' for a resistor or 'V' for a voltage source
+        :param index: index of the element in the network's list for that kind
+        :return: nothing
+        """
+        self.Entries.setdefault(self.Key(n1, n2), []).append((kind, index, n1, n2))
+        self.Count += 1
+
+    def Find(self, n1, n2, kind=None):
+        """
+        Looks up the element between two nodes.  Resistors are returned before voltage sources when an element
+        of either kind connects the nodes.
+        :param n1: the node traversal starts from
+        :param n2: the node traversal ends at
+        :param kind: optional 'R' or 'V' to restrict the search to one kind of element
+        :return: a tuple (kind, index, sign) where sign is +1 if going from n1 to n2 follows the orientation of the
+                 element and -1 otherwise, or None if no such element exists
+        """
+        entries = self.Entries.get(self.Key(n1, n2), ())
+        for k, index, a, b in sorted(entries, key=lambda e: e[0] != 'R'):
+            if kind is None or kind == k:
+                return k, index, (1 if (a, b) == (n1, n2) else -1)
+        return None
+    #endregion
+#endregion
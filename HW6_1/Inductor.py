@@ -0,0 +1,16 @@
+#region classes
+class Inductor():
+    #region constructor
+    def __init__(self, L=1.0e-3, name='ab'):
+        """
+        Defines an inductor to have a self.Inductance and self.Name.  Inductors only take part in AC analysis, where
+        their currents are unknowns of the MNA system (see ResistorNetwork.AnalyzeAC).
+        :param L: inductance in Henry (float)
+        :param name: name of inductor by alphabetically ordered pair of node names
+        """
+        #region attributes
+        self.Inductance = L  # Set the inductance of the inductor
+        self.Name = name     # Set the name of the inductor
+        #endregion
+    #endregion
+#endregion
\ No newline at end of file
@@ -1,12 +1,20 @@
-#region class definitions
-class Loop():
-    #region constructor
-    def __init__(self):
-        """
-        Defines a loop as a list of node names.
-        """
-        #region attributes
-        self.Nodes = []
-        #endregion
-    #endregion
+#region imports
+import numpy as np
+#endregion
+
+#region class definitions
+class Loop():
+    #region constructor
+    def __init__(self):
+        """
+        Defines a loop as a list of node names.  Once compiled by the network, the loop also stores the indices
+        of the elements it traverses (resistors first, then voltage sources) and the sign each one contributes.
+        """
+        #region attributes
+        self.Name = ''
+        self.Nodes = []
+        self.Elements = np.zeros(0, dtype=int)  # element indices into Resistors + VSources
+        self.Signs = np.zeros(0)  # +/-1 contribution of each element to the loop voltage rise
+        #endregion
+    #endregion
 #endregion
\ No newline at end of file
@@ -0,0 +1,68 @@
+#region imports
+from collections import deque
+import numpy as np
+#endregion
+
+#region function definitions
+def FindFundamentalLoops(pairs):
+    """
+    Finds a minimal set of independent loops of a network graph.  A breadth first spanning tree (forest if the
+    graph is not connected) is grown over the nodes and every edge that is not in the tree closes exactly one
+    fundamental loop through the tree, so there are (edges - nodes + components) loops in total.
+    :param pairs: a list of (node1, node2) tuples, one for each edge (i.e., element) of the network
+    :return: a list of loops, each a tuple (edges, signs, nodes) where edges is an int array of edge indices in
+             traversal order, signs is +1 where the edge is traversed from node1 to node2 and -1 otherwise, and
+             nodes is the list of node names visited starting with node1 of the closing edge
+    """
+    adjacent = {}
+    for k, (a, b) in enumerate(pairs):
+        adjacent.setdefault(a, []).append((k, b, 1))
+        adjacent.setdefault(b, []).append((k, a, -1))
+
+    # parent[n] = (parent node, tree edge, sign of traversing the edge from the parent to n)
+    parent = {}
+    depth = {}
+    inTree = np.zeros(len(pairs), dtype=bool)
+    for root in adjacent:
+        if root in depth:
+            continue
+        depth[root] = 0
+        parent[root] = None
+        queue = deque([root])
+        while queue:
+            n = queue.popleft()
+            for k, m, sgn in adjacent[n]:
+                if m not in depth:
+                    depth[m] = depth[n] + 1
+                    parent[m] = (n, k, sgn)
+                    inTree[k] = True
+                    queue.append(m)
+
+    loops = []
+    for k in np.flatnonzero(~inTree):
+        u, v = pairs[k]
+        # climb from both ends of the closing edge to their lowest common ancestor
+        up = []  # tree edges from v up to the ancestor, traversed child to parent
+        down = []  # tree edges from u up to the ancestor, traversed later from parent to child
+        nodesUp = [v]
+        nodesDown = []
+        a, b = v, u
+        while a != b:
+            if depth[a] >= depth[b]:
+                p, e, sgn = parent[a]
+                up.append((e, -sgn))
+                a = p
+                nodesUp.append(a)
+            else:
+                p, e, sgn = parent[b]
+                down.append((e, sgn))
+                nodesDown.append(b)
+                b = p
+        path = [(k, 1)] + up + down[::-1]
+        nodes = [u] + nodesUp + nodesDown[::-1]
+        nodes = nodes[:-1] if len(nodes) > 1 and nodes[-1] == u else nodes
+        edges = np.array([e for e, s in path], dtype=int)
+        signs = np.array([s for e, s in path], dtype=float)
+        loops.append((edges, signs, nodes))
+    return loops
+#endregion
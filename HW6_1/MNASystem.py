@@ -0,0 +1,224 @@
+#region imports
+import numpy as np
+from scipy.sparse import csc_matrix, coo_matrix
+from scipy.sparse.linalg import splu
+#endregion
+
+#region class definitions
+class MNASystem():
+    #region constructor
+    def __init__(self, n1, n2, s1, s2, nNodes):
+        """
+        The modified nodal analysis (MNA) system for a network of two terminal branches and ideal voltage sources.
+        The unknowns are the voltages of the non-ground nodes followed by the currents through the voltage sources.
+        The sparsity pattern of the matrix only depends on the topology, so it is assembled once here and the
+        branch admittances are scattered into it each time a matrix is needed.
+        :param n1: (int array) index of the first node of each branch (-1 for the ground node)
+        :param n2: (int array) index of the second node of each branch (-1 for the ground node)
+        :param s1: (int array) index of the first node of each voltage source (-1 for the ground node)
+        :param s2: (int array) index of the second node of each voltage source (-1 for the ground node)
+        :param nNodes: number of non-ground nodes
+        """
+        #region attributes
+        self.N1 = np.asarray(n1, dtype=int)  # first node of each branch
+        self.N2 = np.asarray(n2, dtype=int)  # second node of each branch
+        self.S1 = np.asarray(s1, dtype=int)  # first node of each voltage source
+        self.S2 = np.asarray(s2, dtype=int)  # second node of each voltage source
+        self.NumNodes = nNodes
+        self.NumBranches = len(self.N1)
+        self.NumSources = len(self.S1)
+        self.Size = nNodes + self.NumSources  # number of unknowns
+        #endregion
+        self.BuildPattern()
+    #endregion
+
+    #region methods
+    def BuildPattern(self):
+        """
+        Builds the compressed sparse column pattern of the MNA matrix.  Each branch with admittance y stamps
+        +y on the diagonal of both of its nodes and -y on the two off diagonal entries.  Each voltage source k
+        between nodes a and b adds the current unknown I_k to the KCL rows (leaving a, entering b) and the
+        constraint V_b - V_a = E_k, i.e., the voltage rises when going from a to b.
+        :return: nothing
+        """
+        nB = self.NumBranches
+        k = np.arange(nB)
+        # branch stamps: (row, col, sign, branch)
+        rows = np.concatenate([self.N1, self.N2, self.N1, self.N2])
+        cols = np.concatenate([self.N1, self.N2, self.N2, self.N1])
+        sign = np.concatenate([np.ones(2 * nB), -np.ones(2 * nB)])
+        branch = np.concatenate([k, k, k, k])
+        keep = (rows >= 0) & (cols >= 0)  # the ground row and column are dropped
+        rows, cols, sign, branch = rows[keep], cols[keep], sign[keep], branch[keep]
+
+        # voltage source stamps (constant +/-1 entries)
+        src = self.NumNodes + np.arange(self.NumSources)
+        sRows = np.concatenate([self.S1, self.S2, src, src])
+        sCols = np.concatenate([src, src, self.S1, self.S2])
+        sVals = np.concatenate([np.ones(self.NumSources), -np.ones(self.NumSources),
+                                -np.ones(self.NumSources), np.ones(self.NumSources)])
+        keep = (sRows >= 0) & (sCols >= 0)
+        sRows, sCols, sVals = sRows[keep], sCols[keep], sVals[keep]
+
+        # unique (row, col) slots in column major order give the csc pattern directly
+        keys = np.concatenate([cols * self.Size + rows, sCols * self.Size + sRows])
+        slotKeys, slot = np.unique(keys, return_inverse=True)
+        nSlots = len(slotKeys)
+        self.Indices = (slotKeys % self.Size).astype(np.int32)
+        self.Indptr = np.concatenate([[0], np.cumsum(np.bincount(slotKeys // self.Size, minlength=self.Size))]).astype(np.int32)
+        self.Cols = (slotKeys // self.Size).astype(np.int32)  # column of each slot, used for dense assembly
+
+        nb = len(rows)
+        # Scatter maps a vector of branch admittances onto the csc data array
+        self.Scatter = coo_matrix((sign, (slot[:nb], branch)), shape=(nSlots, nB)).tocsr()
+        self.ConstData = np.bincount(slot[nb:], weights=sVals, minlength=nSlots)
+
+    def MatrixData(self, y):
+        """
+        Scatters branch admittances into the csc data array of the MNA matrix.
+        :param y: branch admittances, shape (NumBranches,) or (NumBranches, nSamples)
+        :return: the data array, shape (nnz,) or (nnz, nSamples)
+        """
+        data = self.Scatter @ y
+        if data.ndim == 1:
+            return data + self.ConstData
+        return data + self.ConstData[:, None]
+
+    def Matrix(self, y):
+        """
+        Assembles the MNA matrix for a set of branch admittances.
+        :param y: branch admittances (float or complex array)
+        :return: the MNA matrix as a scipy.sparse csc_matrix
+        """
+        return csc_matrix((self.MatrixData(y), self.Indices, self.Indptr), shape=(self.Size, self.Size))
+
+    def BranchMatrix(self, y):
+        """
+        Assembles the branch stamps alone, without the constant entries of the voltage sources, e.g. the part of
+        the AC system proportional to j*w.
+        :param y: branch coefficients (float or complex array)
+        :return: a scipy.sparse csc_matrix of the shape of the MNA matrix
+        """
+        return csc_matrix((self.Scatter @ y, self.Indices, self.Indptr), shape=(self.Size, self.Size))
+
+    def Rhs(self, E):
+        """
+        The right hand side of the MNA system for a set of source voltages.
+        :param E: source voltages, shape (NumSources,) or (NumSources, nSamples)
+        :return: the right hand side vector (or matrix with one column per sample)
+        """
+        E = np.asarray(E)
+        b = np.zeros((self.Size,) + E.shape[1:], dtype=np.result_type(E, float))
+        b[self.NumNodes:] = E
+        return b
+
+    def Factorize(self, y):
+        """
+        Factorizes the MNA matrix with a sparse LU decomposition.
+        :param y: branch admittances
+        :return: a scipy SuperLU object
+        """
+        return splu(self.Matrix(y))
+
+    def Solve(self, y, E):
+        """
+        Solves the MNA system.
+        :param y: branch admittances
+        :param E: source voltages
+        :return: the solution vector (node voltages followed by source currents)
+        """
+        return self.Factorize(y).solve(self.Rhs(E))
+
+    def SolveBatch(self, Y, E, denseSize=64, chunkBytes=2**26):
+        """
+        Solves the MNA system for many samples of branch admittances and source voltages on the same topology.
+        The sparsity pattern is shared by all samples, so the admittances of every sample are scattered into it
+        with one sparse product.  Small systems are then solved in chunks with a batched dense solve.  Larger
+        systems compute a fill reducing column ordering once, from the first sample, and reuse it for the sparse
+        LU factorization of every other sample.
+        :param Y: branch admittances, shape (NumBranches, nSamples)
+        :param E: source voltages, shape (NumSources, nSamples)
+        :param denseSize: systems up to this size use the batched dense solver; its O(n^3) cost per sample overtakes
+                          the sparse path at around 100 unknowns for real and 75 for complex systems
+        :param chunkBytes: approximate memory limit for one chunk of dense matrices
+        :return: solution vectors, shape (Size, nSamples)
+        """
+        data = self.MatrixData(Y)
+        b = self.Rhs(E)
+        nSamples = data.shape[1]
+        X = np.empty((self.Size, nSamples), dtype=np.result_type(data, b))
+        if self.Size <= denseSize:
+            chunk = max(1, chunkBytes // (self.Size**2 * X.itemsize))
+            for start in range(0, nSamples, chunk):
+                stop = min(start + chunk, nSamples)
+                A = np.zeros((stop - start, self.Size, self.Size), dtype=X.dtype)
+                A[:, self.Indices, self.Cols] = data[:, start:stop].T
+                X[:, start:stop] = np.linalg.solve(A, b[:, start:stop].T[..., None])[..., 0].T
+            return X
+
+        # reuse the column ordering of the first factorization, permuting the data slots once
+        perm = splu(csc_matrix((data[:, 0], self.Indices, self.Indptr), shape=(self.Size, self.Size))).perm_c
+        order = np.argsort(perm)  # column j of the permuted matrix is column order[j] of the original one
+        slotMap = csc_matrix((np.arange(1, len(self.Indices) + 1, dtype=float), self.Indices, self.Indptr),
+                             shape=(self.Size, self.Size))[:, order]
+        pIndices, pIndptr = slotMap.indices, slotMap.indptr
+        pSlots = slotMap.data.astype(int) - 1
+        for k in range(nSamples):
+            A = csc_matrix((data[pSlots, k], pIndices, pIndptr), shape=(self.Size, self.Size))
+            X[order, k] = splu(A, permc_spec='NATURAL').solve(b[:, k])
+        return X
+
+    def BranchInjection(self, i):
+        """
+        The KCL contribution of known branch currents: +i in the row of each branch's first node and -i in the
+        row of its second node (ground dropped), zero in the source rows.
+        :param i: current in every branch from its first to its second node
+        :return: a vector of length Size
+        """
+        out = np.bincount(self.N1 + 1, i, minlength=self.Size + 1)
+        out -= np.bincount(self.N2 + 1, i, minlength=self.Size + 1)
+        return out[1:]
+
+    def BranchVector(self, k):
+        """
+        The incidence vector u of branch k, with +1 at its first node and -1 at its second node (ground dropped),
+        so that the branch stamps y * u * u^T into the MNA matrix.
+        :param k: branch index
+        :return: a dense vector of length Size
+        """
+        u = np.zeros(self.Size)
+        if self.N1[k] >= 0:
+            u[self.N1[k]] += 1.0
+        if self.N2[k] >= 0:
+            u[self.N2[k]] -= 1.0
+        return u
+
+    def NodeVoltages(self, x):
+        """
+        Node voltages from a solution vector with the ground node appended last, so that the ground index -1
+        used in N1, N2, S1 and S2 picks up 0 volts.
+        :param x: solution vector(s)
+        :return: node voltages, shape (NumNodes + 1,) or (NumNodes + 1, nSamples)
+        """
+        V = x[:self.NumNodes]
+        return np.concatenate([V, np.zeros((1,) + V.shape[1:], dtype=V.dtype)])
+
+    def BranchCurrents(self, y, x):
+        """
+        Branch currents from the first node to the second node of each branch.
+        :param y: branch admittances
+        :param x: solution vector(s)
+        :return: branch currents
+        """
+        V = self.NodeVoltages(x)
+        return y * (V[self.N1] - V[self.N2])
+
+    def SourceCurrents(self, x):
+        """
+        Currents through the voltage sources from their first node to their second node.
+        :param x: solution vector(s)
+        :return: source currents
+        """
+        return x[self.NumNodes:]
+    #endregion
+#endregion
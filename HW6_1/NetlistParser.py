@@ -0,0 +1,125 @@
+#region imports
+import os
+import tempfile
+import zipfile
+import numpy as np
+#endregion
+
+#region constants
+# the fields read for each kind of block in a netlist: (field, type, default)
+BLOCKS = {
+    'resistor': [('name', str, 'ab'), ('resistance', float, 1.0)],
+    'diode': [('name', str, 'ab'), ('is', float, 1.0e-12), ('n', float, 1.0)],
+    'capacitor': [('name', str, 'ab'), ('capacitance', float, 1.0e-6)],
+    'inductor': [('name', str, 'ab'), ('inductance', float, 1.0e-3)],
+    'source': [('name', str, 'ab'), ('value', float, 12.0), ('type', str, 'voltage'), ('phase', float, 0.0)],
+    'loop': [('name', str, ''), ('nodes', list, None)],
+}
+CACHE_VERSION = 3  # bump when the layout of the compiled cache changes
+#endregion
+
+#region function definitions
+def ParseNetlist(lines):
+    """
+    Parses a netlist in a single pass over its lines.  A block starts with either a tag such as <Resistor> or a
+    line holding only the block keyword (e.g., Resistor), and ends at its closing tag or at the start of the next
+    block.  Inside a block every 'key = value' line sets one field.  Text after a '#' is a comment, and keywords
+    must match a whole token, so an element named 'source' or a field value containing 'loop' is not mistaken
+    for the start of a block.  Everything is converted to lower case.
+    :param lines: an iterable of text lines, e.g. an open file handle
+    :return: a dictionary of numpy arrays, '<kind>_<field>' for each field of each kind of block, with the
+             nodes of all loops flattened into 'loop_nodes' and delimited by 'loop_offsets'
+    """
+    blocks = {kind: [] for kind in BLOCKS}
+    current = None
+    for line in lines:
+        txt = line.split('#', 1)[0].strip().lower()
+        if not txt:
+            continue
+        if txt[0] == '<':
+            tag = txt.strip('<>/ ')
+            current = None
+            if not txt.startswith('</') and tag in BLOCKS:
+                current = {}
+                blocks[tag].append(current)
+        elif '=' in txt:
+            if current is not None:
+                key, value = txt.split('=', 1)
+                current[key.strip()] = value.strip()
+        elif txt in BLOCKS:
+            current = {}
+            blocks[txt].append(current)
+
+    arrays = {}
+    for kind, fields in BLOCKS.items():
+        for field, ftype, default in fields:
+            if ftype is list:
+                items = [[n for n in b.get(field, '').replace(' ', '').split(',') if n] for b in blocks[kind]]
+                # a loop listed with its start node repeated at the end is closed implicitly
+                items = [n[:-1] if len(n) > 1 and n[0] == n[-1] else n for n in items]
+                arrays[kind + '_' + field] = np.array([n for item in items for n in item], dtype=str)
+                arrays[kind + '_offsets'] = np.cumsum([0] + [len(item) for item in items])
+            else:
+                values = [ftype(b.get(field, default)) for b in blocks[kind]]
+                arrays[kind + '_' + field] = np.array(values, dtype=float if ftype is float else str)
+    return arrays
+
+
+def SaveCache(filename, **arrays):
+    """
+    Writes arrays to the .npz file filename atomically: a temporary file in the same directory is written first
+    and then renamed over filename, so a reader never sees a half written sidecar.  Failures are ignored, as the
+    cache is optional (e.g. the directory may be read only); the temporary file is removed whatever goes wrong.
+    :param filename: the .npz file
+    :param arrays: the arrays to save, by name
+    :return: nothing
+    """
+    try:
+        fd, tmpName = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(filename)))
+    except OSError:
+        return
+    replaced = False
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            np.savez(fh, **arrays)
+        # mkstemp creates the file private (0600), give the sidecar the mode of any other new file
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmpName, 0o666 & ~umask)
+        os.replace(tmpName, filename)
+        replaced = True
+    except OSError:
+        pass
+    finally:
+        if not replaced:
+            try:
+                os.remove(tmpName)
+            except OSError:
+                pass
+
+def LoadNetlist(filename, useCache=False):
+    """
+    Reads a netlist file, optionally through a compiled .npz sidecar (filename + '.npz') holding the element
+    arrays.  The sidecar records the size and modification time of the text file, and is only used while the
+    text file is unchanged; otherwise the text is parsed again and the sidecar rewritten.
+    :param filename: the netlist file
+    :param useCache: True to read and write the compiled sidecar
+    :return: the dictionary of arrays produced by ParseNetlist
+    """
+    stat = os.stat(filename)
+    stamp = np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    cacheName = filename + '.npz'
+    if useCache and os.path.exists(cacheName):
+        try:
+            with np.load(cacheName, allow_pickle=False) as cached:
+                if np.array_equal(cached['stamp'], stamp):
+                    return {k: cached[k] for k in cached.files if k != 'stamp'}
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            pass  # unreadable (e.g. truncated) cache, parse the text instead
+
+    with open(filename, 'r', encoding='utf-8') as fh:
+        arrays = ParseNetlist(fh)
+    if useCache:
+        SaveCache(cacheName, stamp=stamp, **arrays)
+    return arrays
+#endregion
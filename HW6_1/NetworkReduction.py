@@ -0,0 +1,98 @@
+#region imports
+import numpy as np
+#endregion
+
+#region class definitions
+class NetworkReduction():
+    #region constructor
+    def __init__(self, pairs, conductances, terminals, maxDegree=2):
+        """
+        Reduces a resistor network before it is solved.  Resistors between the same two nodes are merged into one
+        conductance (parallel reduction), and internal nodes connected to at most maxDegree neighbours are
+        eliminated by the star-mesh transform: a node with neighbours i, j and conductances g_i, g_j becomes a
+        direct conductance g_i * g_j / sum(g) between every pair of neighbours.  For maxDegree=2 this is exactly
+        series reduction, maxDegree=3 adds the star (wye) to delta transform.  Eliminated nodes carry no external
+        current, so their voltages are recovered afterwards as the conductance weighted average of their
+        neighbours, and the current in every original resistor follows from Ohm's law.
+        :param pairs: a list of (node1, node2) tuples, one for each resistor
+        :param conductances: the conductance of each resistor
+        :param terminals: nodes that must not be eliminated (e.g., source nodes, ground, nodes of interest)
+        :param maxDegree: the largest number of neighbours of a node that is eliminated
+        """
+        #region attributes
+        self.Pairs = pairs
+        self.Terminals = set(terminals)
+        self.MaxDegree = maxDegree
+        self.Eliminated = []  # stack of (node, [(neighbour, conductance), ...]) in order of elimination
+        self.Adjacent = {}  # node -> {neighbour: conductance} for the reduced network
+        #endregion
+        for (a, b), g in zip(pairs, conductances):
+            if a != b:
+                self.Connect(a, b, g)
+        self.Reduce()
+    #endregion
+
+    #region methods
+    def Connect(self, a, b, g):
+        """
+        Adds a conductance between two nodes, merging it with any conductance already between them.
+        :return: nothing
+        """
+        self.Adjacent.setdefault(a, {})
+        self.Adjacent.setdefault(b, {})
+        self.Adjacent[a][b] = self.Adjacent[a].get(b, 0.0) + g
+        self.Adjacent[b][a] = self.Adjacent[b].get(a, 0.0) + g
+
+    def Reduce(self):
+        """
+        Eliminates internal nodes of low degree until none are left.  Eliminating a node only changes the degree
+        of its neighbours, so those are the only nodes checked again.
+        :return: nothing
+        """
+        work = [n for n in self.Adjacent]
+        while work:
+            n = work.pop()
+            if n in self.Terminals or n not in self.Adjacent or len(self.Adjacent[n]) > self.MaxDegree:
+                continue
+            star = list(self.Adjacent.pop(n).items())
+            total = sum(g for m, g in star)
+            for m, g in star:
+                del self.Adjacent[m][n]
+            for i in range(len(star)):
+                for j in range(i + 1, len(star)):
+                    self.Connect(star[i][0], star[j][0], star[i][1] * star[j][1] / total)
+            self.Eliminated.append((n, star))
+            work.extend(m for m, g in star)
+
+    def ReducedBranches(self):
+        """
+        The branches of the reduced network.
+        :return: a list of (node1, node2) tuples and an array of their conductances
+        """
+        pairs = []
+        g = []
+        for a, neighbours in self.Adjacent.items():
+            for b, gab in neighbours.items():
+                if a < b:
+                    pairs.append((a, b))
+                    g.append(gab)
+        return pairs, np.array(g)
+
+    def Nodes(self):
+        """
+        :return: the nodes left in the reduced network (isolated terminals included)
+        """
+        return set(self.Adjacent) | self.Terminals
+
+    def RecoverVoltages(self, V):
+        """
+        Back substitutes the voltages of the eliminated nodes in reverse order of elimination.
+        :param V: a dictionary of node voltages for the reduced network, completed in place
+        :return: the completed dictionary
+        """
+        for n, star in reversed(self.Eliminated):
+            total = sum(g for m, g in star)
+            V[n] = sum(g * V[m] for m, g in star) / total if total > 0 else 0.0
+        return V
+    #endregion
+#endregion
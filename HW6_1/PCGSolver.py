@@ -0,0 +1,189 @@
+#region imports
+from collections import deque
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.linalg import LinearOperator, cg
+#endregion
+
+#region class definitions
+class SupernodeLaplacian():
+    #region constructor
+    def __init__(self, n1, n2, g, s1, s2, E, ground, nNodes):
+        """
+        The symmetric positive definite conductance Laplacian of a resistor network, applied matrix free.  Ideal
+        voltage sources would make the MNA system indefinite, so the nodes joined by sources are merged into
+        supernodes instead: within a supernode every node voltage is the voltage of the supernode's root plus a
+        fixed offset given by the sources, V = phi[comp] + offset.  KCL summed over each supernode then only
+        involves the resistors, and with the supernode holding the ground node fixed at 0 V the remaining system
+        in phi is SPD for a connected network.  Storage is a handful of arrays of the length of the element lists.
+        :param n1: (int array) first node of each resistor
+        :param n2: (int array) second node of each resistor
+        :param g: conductance of each resistor
+        :param s1: (int array) first node of each voltage source
+        :param s2: (int array) second node of each voltage source
+        :param E: source voltages, V(s2) - V(s1) = E
+        :param ground: index of the reference node
+        :param nNodes: number of nodes (ground included)
+        """
+        #region attributes
+        self.N1 = np.asarray(n1, dtype=int)
+        self.N2 = np.asarray(n2, dtype=int)
+        self.G = np.asarray(g, dtype=float)
+        self.S1 = np.asarray(s1, dtype=int)
+        self.S2 = np.asarray(s2, dtype=int)
+        self.E = np.asarray(E, dtype=float)
+        self.NumNodes = nNodes
+        #endregion
+        self.BuildSupernodes(ground)
+    #endregion
+
+    #region methods
+    def BuildSupernodes(self, ground):
+        """
+        Groups the nodes connected by voltage sources with a breadth first search over the sources, recording
+        each node's supernode, voltage offset, and the source that reached it (for recovering source currents).
+        Unknowns are numbered so that the supernode of the ground node is last, and it is dropped from the system.
+        :param ground: index of the reference node
+        :return: nothing
+        """
+        adjacent = {}
+        for k, (a, b) in enumerate(zip(self.S1, self.S2)):
+            adjacent.setdefault(a, []).append((k, b, 1.0))
+            adjacent.setdefault(b, []).append((k, a, -1.0))
+        comp = -np.ones(self.NumNodes, dtype=int)
+        offset = np.zeros(self.NumNodes)
+        inTree = np.zeros(len(self.S1), dtype=bool)
+        self.Order = []  # nodes reached through a source, in breadth first order: (node, parent, source)
+        nComp = 0
+        for root in [ground] + list(range(self.NumNodes)):
+            if comp[root] >= 0:
+                continue
+            comp[root] = nComp
+            queue = deque([root])
+            while queue:
+                n = queue.popleft()
+                for k, m, sgn in adjacent.get(n, ()):
+                    if comp[m] < 0:
+                        comp[m] = nComp
+                        offset[m] = offset[n] + sgn * self.E[k]
+                        inTree[k] = True
+                        self.Order.append((m, n, k))
+                        queue.append(m)
+                    elif not inTree[k]:
+                        raise ValueError('The voltage sources form a loop, so their currents are undetermined.')
+            nComp += 1
+        # the ground supernode (number 0) is moved to the end, as the extra entry fixed at 0 V
+        self.Size = nComp - 1  # number of unknowns
+        self.Comp = (comp - 1) % nComp
+        self.Offset = offset - offset[ground]
+        c1, c2 = self.Comp[self.N1], self.Comp[self.N2]
+        cross = c1 != c2  # resistors inside one supernode carry a fixed current and drop out of the system
+        self.C1, self.C2, self.CG = c1[cross], c2[cross], self.G[cross]
+
+    def Matvec(self, phi):
+        """
+        Applies the Laplacian to a vector of supernode voltages, edge by edge.
+        :param phi: voltages of the supernodes (ground supernode excluded)
+        :return: the net resistor current leaving each supernode
+        """
+        phi = np.append(phi, 0.0)
+        w = self.CG * (phi[self.C1] - phi[self.C2])
+        y = np.bincount(self.C1, w, minlength=self.Size + 1) - np.bincount(self.C2, w, minlength=self.Size + 1)
+        return y[:-1]
+
+    def Diagonal(self):
+        """
+        :return: the diagonal of the Laplacian, for the Jacobi preconditioner
+        """
+        d = np.bincount(self.C1, self.CG, minlength=self.Size + 1)
+        d += np.bincount(self.C2, self.CG, minlength=self.Size + 1)
+        return d[:-1]
+
+    def Assemble(self):
+        """
+        Assembles the Laplacian as a sparse matrix, for preconditioners that need the matrix entries.
+        :return: a csr_matrix
+        """
+        keep1, keep2 = self.C1 < self.Size, self.C2 < self.Size
+        both = keep1 & keep2
+        rows = np.concatenate([self.C1[keep1], self.C2[keep2], self.C1[both], self.C2[both]])
+        cols = np.concatenate([self.C1[keep1], self.C2[keep2], self.C2[both], self.C1[both]])
+        vals = np.concatenate([self.CG[keep1], self.CG[keep2], -self.CG[both], -self.CG[both]])
+        return coo_matrix((vals, (rows, cols)), shape=(self.Size, self.Size)).tocsr()
+
+    def Rhs(self):
+        """
+        The right hand side: minus the current the source offsets alone drive out of each supernode.
+        :return: the right hand side vector
+        """
+        w = self.CG * (self.Offset[self.N1] - self.Offset[self.N2])[self.Comp[self.N1] != self.Comp[self.N2]]
+        b = np.bincount(self.C1, w, minlength=self.Size + 1) - np.bincount(self.C2, w, minlength=self.Size + 1)
+        return -b[:-1]
+
+    def NodeVoltages(self, phi):
+        """
+        :param phi: voltages of the supernodes (ground supernode excluded)
+        :return: the voltage of every node
+        """
+        return np.append(phi, 0.0)[self.Comp] + self.Offset
+
+    def SourceCurrents(self, V):
+        """
+        Recovers the current through every voltage source from KCL, working from the leaves of each supernode's
+        source tree back to its root.
+        :param V: node voltages
+        :return: source currents, positive through the source from its first to its second node
+        """
+        w = self.G * (V[self.N1] - V[self.N2])
+        outflow = np.bincount(self.N1, w, minlength=self.NumNodes) - np.bincount(self.N2, w, minlength=self.NumNodes)
+        I = np.zeros(len(self.S1))
+        for n, p, k in reversed(self.Order):
+            q = -outflow[n]  # current leaving n into the source that connects it to its parent
+            I[k] = q if self.S1[k] == n else -q
+            outflow[p] -= q
+        return I
+    #endregion
+#endregion
+
+#region function definitions
+def SolvePCG(system, preconditioner='jacobi', tol=1e-10, maxIter=None):
+    """
+    Solves a SupernodeLaplacian with the preconditioned conjugate gradient method.
+    :param system: a SupernodeLaplacian
+    :param preconditioner: 'jacobi' (matrix free diagonal scaling), 'amg' (smoothed aggregation algebraic multigrid
+                           on the assembled matrix, needs the optional pyamg package) or None
+    :param tol: relative residual tolerance
+    :param maxIter: maximum number of iterations (defaults to 10 times the number of unknowns)
+    :return: a tuple (phi, info) where info is a dictionary with 'converged', 'iterations' and 'residual'
+             (the final relative residual norm)
+    """
+    n = system.Size
+    A = LinearOperator((n, n), matvec=system.Matvec, dtype=float)
+    b = system.Rhs()
+    if preconditioner is None:
+        M = None
+    elif preconditioner == 'jacobi':
+        d = system.Diagonal()
+        d[d == 0] = 1.0
+        M = LinearOperator((n, n), matvec=lambda r: r / d, dtype=float)
+    elif preconditioner == 'amg':
+        try:
+            import pyamg
+        except ImportError:
+            raise ImportError("The 'amg' preconditioner needs the pyamg package.")
+        M = pyamg.smoothed_aggregation_solver(system.Assemble()).aspreconditioner()
+    else:
+        raise ValueError("Unknown preconditioner '{}'".format(preconditioner))
+
+    iterations = [0]
+
+    def Count(xk):
+        iterations[0] += 1
+
+    bNorm = np.linalg.norm(b)
+    if bNorm == 0.0:
+        return np.zeros(n), {'converged': True, 'iterations': 0, 'residual': 0.0}
+    phi, status = cg(A, b, rtol=tol, maxiter=maxIter if maxIter is not None else 10 * n, M=M, callback=Count)
+    residual = np.linalg.norm(b - system.Matvec(phi)) / bNorm
+    return phi, {'converged': status == 0, 'iterations': iterations[0], 'residual': residual}
+#endregion
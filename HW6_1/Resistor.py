@@ -1,28 +1,50 @@
-#region classes
-class Resistor():
-    #region constructor
-    def __init__(self, R=1.0, i=0.0, name='ab'):
-        """
-        Defines a resistor to have a self.Resistance, self.Current, and self.Name
-        :param R: resistance in Ohm (float)
-        :param i: current in amps (float)
-        :param name: name of resistor by alphabetically ordered pair of node names
-        """
-        #region attributes
-        self.Resistance = R  # Set the resistance of the resistor
-        self.Current = i     # Set the current through the resistor
-        self.Name = name     # Set the name of the resistor
-        self.V = self.DeltaV()  # Calculate the voltage drop across the resistor
-        #endregion
-    #endregion
-
-    #region methods
-    def DeltaV(self):
-        """
-        Calculates voltage change across resistor.
-        :return:  voltage drop across resistor as a float
-        """
-        self.V = self.Current * self.Resistance  # Calculate voltage drop using Ohm's Law
-        return self.V
-    #endregion
+#region imports
+import numpy as np
+#endregion
+
+#region classes
+class Resistor():
+    #region constructor
+    def __init__(self, R=1.0, i=0.0, name='ab'):
+        """
+        Defines a resistor to have a self.Resistance, self.Current, and self.Name
+        :param R: resistance in Ohm (float)
+        :param i: current in amps (float)
+        :param name: name of resistor by alphabetically ordered pair of node names
+        """
+        #region attributes
+        self.Resistance = R  # Set the resistance of the resistor
+        self.Current = i     # Set the current through the resistor
+        self.Name = name     # Set the name of the resistor
+        self.V = self.DeltaV()  # Calculate the voltage drop across the resistor
+        self.IsLinear = True  # nonlinear elements are solved by Newton's method
+        #endregion
+    #endregion
+
+    #region methods
+    def DeltaV(self):
+        """
+        Calculates voltage change across resistor.
+        :return:  voltage drop across resistor as a float
+        """
+        self.V = self.Current * self.Resistance  # Calculate voltage drop using Ohm's Law
+        return self.V
+
+    def GetCurrent(self, v):
+        """
+        The I-V characteristic of the element: current from the first to the second node for a voltage drop v.
+        Nonlinear elements override this together with GetConductance.
+        :param v: voltage drop across the element (float or array)
+        :return: current through the element
+        """
+        return v / self.Resistance
+
+    def GetConductance(self, v):
+        """
+        The analytic derivative dI/dV of GetCurrent, used to assemble the Newton Jacobian.
+        :param v: voltage drop across the element (float or array)
+        :return: the small signal conductance
+        """
+        return np.ones_like(v) / self.Resistance
+    #endregion
 #endregion
\ No newline at end of file
@@ -1,250 +1,726 @@
-#region imports
-from scipy.optimize import fsolve
-from Resistor import Resistor
-from VoltageSource import VoltageSource
-from Loop import Loop
-#endregion
-
-#region class definitions
-class ResistorNetwork():
-    #region constructor
-    def __init__(self):
-        """
-        The resistor network consists of Loops, Resistors and Voltage Sources.
-        This is the constructor for the network and it defines fields for Loops, Resistors and Voltage Sources.
-        You can populate these lists manually or read them in from a file.
-        """
-        #region attributes
-        self.Loops = []  # initialize an empty list of loop objects in the network
-        self.Resistors = []  # initialize an empty a list of resistor objects in the network
-        self.VSources = []  # initialize an empty a list of source objects in the network
-        #endregion
-    #endregion
-
-    #region methods
-    def BuildNetworkFromFile(self, filename):
-        """
-        This function reads the lines from a file and processes the file to populate the fields
-        for Loops, Resistors and Voltage Sources
-        :param filename: string for file to process
-        :return: nothing
-        """
-        try:
-            FileTxt = open(filename, "r").read().split('\n')  # reads from file and splits into lines
-            print(f"Reading file: {filename}")  # Debug statement
-            LineNum = 0
-            # erase any previous
-            self.Resistors = []
-            self.VSources = []
-            self.Loops = []
-            while LineNum < len(FileTxt):
-                lineTxt = FileTxt[LineNum].lower().strip()
-                if len(lineTxt) < 1:
-                    pass  # skip empty lines
-                elif lineTxt[0] == '#':
-                    pass  # skip comment lines
-                elif "resistor" in lineTxt:
-                    print(f"Found resistor at line {LineNum + 1}")  # Debug statement
-                    LineNum = self.MakeResistor(LineNum, FileTxt)
-                elif "source" in lineTxt:
-                    print(f"Found source at line {LineNum + 1}")  # Debug statement
-                    LineNum = self.MakeVSource(LineNum, FileTxt)
-                elif "loop" in lineTxt:
-                    print(f"Found loop at line {LineNum + 1}")  # Debug statement
-                    LineNum = self.MakeLoop(LineNum, FileTxt)
-                LineNum += 1
-            print("Resistors in network:", [r.Name for r in self.Resistors])  # Debug statement
-        except FileNotFoundError:
-            print(f"Error: File '{filename}' not found.")  # Debug statement
-
-    def MakeResistor(self, N, Txt):
-        """
-        Make a resistor object from reading the text file
-        :param N: (int) Line number for current processing
-        :param Txt: [string] the lines of the text file
-        :return: a resistor object
-        """
-        R = Resistor()  # instantiate a new resistor object
-        N += 1  # <Resistor> was detected, so move to next line in Txt
-        while N < len(Txt):  # Ensure we don't go out of bounds
-            txt = Txt[N].lower().strip()  # retrieve line from Txt and make it lower case
-            if "resistor" in txt:
-                break  # Stop if we encounter the next resistor
-            if "name" in txt:
-                R.Name = txt.split('=')[1].strip()
-            if "resistance" in txt:
-                R.Resistance = float(txt.split('=')[1].strip())
-            N += 1
-        print(f"Added resistor: Name = {R.Name}, Resistance = {R.Resistance}")  # Debug statement
-        self.Resistors.append(R)  # append the resistor object to the list of resistors
-        return N
-
-    def MakeVSource(self, N, Txt):
-        """
-        Make a voltage source object from reading the text file
-        :param N: (int) Line number for current processing
-        :param Txt: [string] the lines of the text file
-        :return: a voltage source object
-        """
-        VS = VoltageSource()
-        N += 1
-        while N < len(Txt):  # Ensure we don't go out of bounds
-            txt = Txt[N].lower().strip()
-            if "source" in txt:
-                break  # Stop if we encounter the next source
-            if "name" in txt:
-                VS.Name = txt.split('=')[1].strip()
-            if "value" in txt:
-                VS.Voltage = float(txt.split('=')[1].strip())
-            if "type" in txt:
-                VS.Type = txt.split('=')[1].strip()
-            N += 1
-        self.VSources.append(VS)
-        return N
-
-    def MakeLoop(self, N, Txt):
-        """
-        Make a Loop object from reading the text file
-        :param N: (int) Line number for current processing
-        :param Txt: [string] the lines of the text file
-        :return: a resistor object
-        """
-        L = Loop()
-        N += 1
-        while N < len(Txt):  # Ensure we don't go out of bounds
-            txt = Txt[N].lower().strip()
-            if "loop" in txt:
-                break  # Stop if we encounter the next loop
-            if "name" in txt:
-                L.Name = txt.split('=')[1].strip()
-            if "nodes" in txt:
-                txt = txt.replace(" ", "")
-                L.Nodes = txt.split('=')[1].strip().split(',')
-            N += 1
-        self.Loops.append(L)
-        return N
-
-    def AnalyzeCircuit(self):
-        """
-        Use fsolve to find currents in the resistor network.
-        :return:
-        """
-        # need to set the currents to that Kirchoff's laws are satisfied
-        i0 = [1.0, 1.0, 1.0]  # define an initial guess for the currents in the circuit
-        i = fsolve(self.GetKirchoffVals, i0)
-        # print output to the screen
-        print("I1 = {:0.1f}".format(i[0]))
-        print("I2 = {:0.1f}".format(i[1]))
-        print("I3 = {:0.1f}".format(i[2]))
-        return i
-
-    def GetKirchoffVals(self, i):
-        """
-        This function uses Kirchoff Voltage and Current laws to analyze this specific circuit
-        KVL:  The net voltage drop for a closed loop in a circuit should be zero
-        KCL:  The net current flow into a node in a circuit should be zero
-        :param i: a list of currents relevant to the circuit
-        :return: a list of loop voltage drops and node currents
-        """
-        # set current in resistors in the top loop.
-        self.GetResistorByName('ad').Current = i[0]  # I_1 in diagram
-        self.GetResistorByName('bc').Current = i[0]  # I_1 in diagram
-        self.GetResistorByName('cd').Current = i[2]  # I_3 in diagram
-        # set current in resistor in bottom loop.
-        self.GetResistorByName('ce').Current = i[1]  # I_2 in diagram
-        # calculate net current into node c
-        Node_c_Current = sum([i[0], i[1], -i[2]])
-
-        KVL = self.GetLoopVoltageDrops()  # two equations here
-        KVL.append(Node_c_Current)  # one equation here
-        return KVL
-
-    def GetElementDeltaV(self, name):
-        """
-        Need to retrieve either a resistor or a voltage source by name.
-        :param name:
-        :return:
-        """
-        for r in self.Resistors:
-            if name == r.Name:
-                return -r.DeltaV()
-            if name[::-1] == r.Name:
-                return -r.DeltaV()
-        for v in self.VSources:
-            if name == v.Name:
-                return v.Voltage
-            if name[::-1] == v.Name:
-                return -v.Voltage
-
-    def GetLoopVoltageDrops(self):
-        """
-        This calculates the net voltage drop around a closed loop in a circuit based on the
-        current flowing through resistors (cause a drop in voltage regardless of direction of traversal) or
-        the value of the voltage source that have been set up as positive based on the direction of traversal.
-        :return: net voltage drop for all loops in the network.
-        """
-        loopVoltages = []
-        for L in self.Loops:
-            # Traverse loops in order of nodes and add up voltage drops between nodes
-            loopDeltaV = 0
-            for n in range(len(L.Nodes)):
-                if n == len(L.Nodes) - 1:
-                    name = L.Nodes[0] + L.Nodes[n]
-                else:
-                    name = L.Nodes[n] + L.Nodes[n + 1]
-                loopDeltaV += self.GetElementDeltaV(name)
-            loopVoltages.append(loopDeltaV)
-        return loopVoltages
-
-    def GetResistorByName(self, name):
-        """
-        A way to retrieve a resistor object from self.Resistors based on resistor name
-        :param name:
-        :return:
-        """
-        for r in self.Resistors:
-            if r.Name == name:
-                return r
-        print(f"Resistor '{name}' not found in the network.")  # Debug statement
-        return None
-    #endregion
-
-class ResistorNetwork_2(ResistorNetwork):
-    #region constructor
-    def __init__(self):
-        super().__init__()  # runs the constructor of the parent class
-        #region attributes
-        #endregion
-    #endregion
-
-    #region methods
-    def AnalyzeCircuit(self):
-        """
-        Override AnalyzeCircuit for the second circuit.
-        """
-        i0 = [1.0, 1.0, 1.0]  # define an initial guess for the currents in the circuit
-        i = fsolve(self.GetKirchoffVals, i0)
-        # print output to the screen
-        print("I1 = {:0.1f}".format(i[0]))
-        print("I2 = {:0.1f}".format(i[1]))
-        print("I3 = {:0.1f}".format(i[2]))
-        return i
-
-    def GetKirchoffVals(self, i):
-        """
-        Override GetKirchoffVals for the second circuit.
-        """
-        # set current in resistors in the top loop.
-        self.GetResistorByName('ad').Current = i[0]  # I_1 in diagram
-        self.GetResistorByName('bc').Current = i[0]  # I_1 in diagram
-        self.GetResistorByName('cd').Current = i[2]  # I_3 in diagram
-        # set current in resistor in bottom loop.
-        self.GetResistorByName('ce').Current = i[1]  # I_2 in diagram
-        # calculate net current into node c
-        Node_c_Current = sum([i[0], i[1], -i[2]])
-
-        KVL = self.GetLoopVoltageDrops()  # two equations here
-        KVL.append(Node_c_Current)  # one equation here
-        return KVL
-    #endregion
+#region imports
+import numpy as np
+from scipy.optimize import fsolve
+from scipy.sparse import csr_matrix, coo_matrix, diags, bmat
+from Resistor import Resistor
+from VoltageSource import VoltageSource
+from Capacitor import Capacitor
+from Inductor import Inductor
+from Diode import Diode
+from Loop import Loop
+from MNASystem import MNASystem
+from LoopFinder import FindFundamentalLoops
+from ElementRegistry import ElementRegistry
+from NetlistParser import LoadNetlist
+from NetworkReduction import NetworkReduction
+from PCGSolver import SupernodeLaplacian, SolvePCG
+from SweepSolver import SolveSweep
+#endregion
+
+#region class definitions
+class ResistorNetwork():
+    #region constructor
+    def __init__(self):
+        """
+        The resistor network consists of Loops, Resistors and Voltage Sources.
+        This is the constructor for the network and it defines fields for Loops, Resistors and Voltage Sources.
+        You can populate these lists manually or read them in from a file.
+        """
+        #region attributes
+        self.Loops = []  # initialize an empty list of loop objects in the network
+        self.Resistors = []  # initialize an empty a list of resistor objects in the network
+        self.VSources = []  # initialize an empty a list of source objects in the network
+        self.Capacitors = []  # capacitors, only used by AC analysis
+        self.Inductors = []  # inductors, only used by AC analysis
+        self.NodeVoltages = {}  # node voltages from the last nodal analysis, keyed by node name
+        self.LoopMatrix = None  # signed loop-element matrix compiled from self.Loops
+        self.Registry = ElementRegistry()  # elements indexed by the pair of nodes they connect
+        self.RegistrySignature = None  # identity of the elements in the registry, see UpdateRegistry
+        self.Factorization = None  # MNA system, LU factors, admittances and solution of the last nodal analysis
+        self.LowRankUpdates = {}  # resistor index -> (u, A^-1 u) for resistors changed since the factorization
+        self.MaxLowRankUpdates = 32  # refactorize once this many resistors have been changed
+        self.IterativeInfo = {}  # convergence report of the last iterative solve
+        self.NewtonInfo = {}  # convergence report of the last Newton solve
+        #endregion
+    #endregion
+
+    #region methods
+    def BuildNetworkFromFile(self, filename, useCache=False):
+        """
+        This function reads the lines from a file and processes the file to populate the fields
+        for Loops, Resistors and Voltage Sources.  The file is streamed through a single pass parser, and with
+        useCache the parsed element arrays are kept in a compiled .npz sidecar next to the file so an unchanged
+        netlist is reloaded without parsing.
+        :param filename: string for file to process
+        :param useCache: True to read/write the compiled sidecar (filename + '.npz')
+        :return: nothing
+        """
+        try:
+            arrays = LoadNetlist(filename, useCache)
+        except FileNotFoundError:
+            print(f"Error: File '{filename}' not found.")
+            return
+        # erase any previous
+        self.Resistors = [Resistor(R, name=name) for name, R in
+                          zip(arrays['resistor_name'].tolist(), arrays['resistor_resistance'].tolist())]
+        self.Resistors += [Diode(Is, n, name) for name, Is, n in
+                           zip(arrays['diode_name'].tolist(), arrays['diode_is'].tolist(), arrays['diode_n'].tolist())]
+        self.VSources = [VoltageSource(V, name, vType, phase) for name, V, vType, phase in
+                         zip(arrays['source_name'].tolist(), arrays['source_value'].tolist(),
+                             arrays['source_type'].tolist(), arrays['source_phase'].tolist())]
+        self.Capacitors = [Capacitor(C, name) for name, C in
+                           zip(arrays['capacitor_name'].tolist(), arrays['capacitor_capacitance'].tolist())]
+        self.Inductors = [Inductor(L, name) for name, L in
+                          zip(arrays['inductor_name'].tolist(), arrays['inductor_inductance'].tolist())]
+        self.Loops = []
+        offsets = arrays['loop_offsets']
+        for j, name in enumerate(arrays['loop_name'].tolist()):
+            L = Loop()
+            L.Name = name
+            L.Nodes = arrays['loop_nodes'][offsets[j]:offsets[j + 1]].tolist()
+            self.Loops.append(L)
+        self.LoopMatrix = None
+        self.Factorization = None
+        self.LowRankUpdates = {}
+        self.BuildRegistry()
+
+    def AnalyzeCircuit(self):
+        """
+        Use fsolve to find currents in the resistor network.
+        :return:
+        """
+        # need to set the currents to that Kirchoff's laws are satisfied
+        i0 = [1.0, 1.0, 1.0]  # define an initial guess for the currents in the circuit
+        i = fsolve(self.GetKirchoffVals, i0)
+        # print output to the screen
+        print("I1 = {:0.1f}".format(i[0]))
+        print("I2 = {:0.1f}".format(i[1]))
+        print("I3 = {:0.1f}".format(i[2]))
+        return i
+
+    @staticmethod
+    def SplitName(name):
+        """
+        Splits an element name into the names of the two nodes it connects.  Names are either a pair of
+        one letter node names (e.g., 'ab') or two node names separated by a dash (e.g., 'n12-n13').
+        :param name: element name
+        :return: a tuple of the two node names
+        """
+        if '-' in name:
+            a, b = name.split('-', 1)
+            return a.strip(), b.strip()
+        return name[0], name[1:]
+
+    def GetNodeNames(self):
+        """
+        Collects the names of all nodes that resistors and voltage sources connect.
+        :return: a sorted list of node names
+        """
+        nodes = set()
+        for e in self.Resistors + self.VSources:
+            nodes.update(self.SplitName(e.Name))
+        return sorted(nodes)
+
+    def CheckLinear(self, method):
+        """
+        Linear solvers give a nonlinear element (e.g., a diode, with R = inf) no conductance at all, so they would
+        quietly treat it as an open circuit.  This refuses such networks instead.
+        :param method: name of the calling solver, for the error message
+        :return: nothing
+        """
+        nonlinear = [r.Name for r in self.Resistors if not r.IsLinear]
+        if nonlinear:
+            raise ValueError("{} only solves linear networks, but {} {} nonlinear; use AnalyzeCircuitNewton.".format(
+                method, ', '.join(nonlinear), 'is' if len(nonlinear) == 1 else 'are'))
+
+    def BuildMNASystem(self, ground=None):
+        """
+        Builds the sparse modified nodal analysis system straight from self.Resistors and self.VSources.
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :return: a MNASystem object
+        """
+        nodes = self.GetNodeNames()
+        if ground is None:
+            ground = nodes[0]
+        # the ground node gets index -1, which MNASystem drops from the equations
+        index = {n: i for i, n in enumerate(nn for nn in nodes if nn != ground)}
+        index[ground] = -1
+        self.Ground = ground
+        self.NodeIndex = index
+
+        def Ends(elements):
+            pairs = [self.SplitName(e.Name) for e in elements]
+            return [index[p[0]] for p in pairs], [index[p[1]] for p in pairs]
+
+        n1, n2 = Ends(self.Resistors)
+        s1, s2 = Ends(self.VSources)
+        return MNASystem(n1, n2, s1, s2, len(nodes) - 1)
+
+    def AnalyzeCircuitMNA(self, ground=None):
+        """
+        Solves the network by modified nodal analysis.  Kirchoff's laws are linear in the node voltages, so a
+        single sparse LU factorization replaces fsolve, and no loops or hand written equations are needed.
+        Networks with nonlinear elements (e.g., diodes) are passed on to AnalyzeCircuitNewton.
+        The current in a resistor is positive when flowing from the first to the second node in its name, and
+        the current in a voltage source is positive when flowing through the source from its first to its
+        second node.
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :return: an array of currents in the resistors (in the order of self.Resistors)
+        """
+        if not all(r.IsLinear for r in self.Resistors):
+            return self.AnalyzeCircuitNewton(ground)
+        mna = self.BuildMNASystem(ground)
+        y = np.array([1.0 / r.Resistance for r in self.Resistors])
+        E = np.array([v.Voltage for v in self.VSources])
+        lu = mna.Factorize(y)
+        x = lu.solve(mna.Rhs(E))
+        # keep the factorization so that SetResistance can update the solution without refactorizing
+        self.Factorization = (mna, lu, y, x)
+        self.LowRankUpdates = {}
+        return self.StoreSolution(mna, y, x)
+
+    def AnalyzeCircuitNewton(self, ground=None, x0=None, tol=1e-9, maxIter=100):
+        """
+        Solves a network with nonlinear elements by a damped Newton method on the MNA equations
+            F(x) = A x - b + (KCL stamps of the nonlinear element currents) = 0
+        where A holds the linear resistors and the sources.  The Jacobian is A plus the analytic conductances
+        dI/dV of the nonlinear elements, scattered into the same sparsity pattern, so each iteration costs one
+        assembly and one sparse LU solve.  A step is halved until it reduces the residual norm.
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :param x0: optional initial MNA solution vector (zeros by default)
+        :param tol: convergence tolerance on the KCL residual (A) and the voltage update (V)
+        :param maxIter: maximum number of Newton iterations
+        :return: an array of currents in the resistors (in the order of self.Resistors)
+        """
+        mna = self.BuildMNASystem(ground)
+        nonlinear = [k for k, r in enumerate(self.Resistors) if not r.IsLinear]
+        yLin = np.array([0.0 if not r.IsLinear else 1.0 / r.Resistance for r in self.Resistors])
+        b = mna.Rhs(np.array([v.Voltage for v in self.VSources]))
+        A = mna.Matrix(yLin)
+        n1, n2 = mna.N1[nonlinear], mna.N2[nonlinear]
+
+        def Residual(x):
+            V = mna.NodeVoltages(x)
+            v = V[n1] - V[n2]
+            i = np.zeros(mna.NumBranches)
+            i[nonlinear] = [self.Resistors[k].GetCurrent(vk) for k, vk in zip(nonlinear, v)]
+            return A @ x - b + mna.BranchInjection(i), v
+
+        x = np.zeros(mna.Size) if x0 is None else np.asarray(x0, dtype=float)
+        F, v = Residual(x)
+        converged = False
+        for iteration in range(maxIter):
+            y = yLin.copy()
+            y[nonlinear] = [self.Resistors[k].GetConductance(vk) for k, vk in zip(nonlinear, v)]
+            dx = -mna.Factorize(y).solve(F)
+            step = 1.0
+            normF = np.linalg.norm(F)
+            for halving in range(30):
+                xNew = x + step * dx
+                FNew, vNew = Residual(xNew)
+                if np.linalg.norm(FNew) < normF or step * np.abs(dx).max() < tol:
+                    break
+                step *= 0.5
+            x, F, v = xNew, FNew, vNew
+            if np.abs(F).max() < tol and step * np.abs(dx).max() < tol:
+                converged = True
+                break
+        self.NewtonInfo = {'converged': converged, 'iterations': iteration + 1, 'residual': np.abs(F).max()}
+        self.Factorization = None  # SetResistance updates only apply to linear networks
+        if not converged:
+            print("Warning: Newton did not converge after {} iterations (residual {:0.3e})".format(
+                iteration + 1, self.NewtonInfo['residual']))
+
+        # store the results on the elements
+        V = mna.NodeVoltages(x)
+        dv = V[mna.N1] - V[mna.N2]
+        i = yLin * dv
+        i[nonlinear] = [self.Resistors[k].GetCurrent(dv[k]) for k in nonlinear]
+        for r, ir, vr in zip(self.Resistors, i, dv):
+            r.Current = ir
+            r.V = vr
+        for s, iv in zip(self.VSources, mna.SourceCurrents(x)):
+            s.Current = iv
+        self.NodeVoltages = {n: V[k] for n, k in self.NodeIndex.items()}
+        return i
+
+    def StoreSolution(self, mna, y, x):
+        """
+        Stores the currents and node voltages of an MNA solution on the elements of the network.
+        :param mna: the MNASystem that was solved
+        :param y: the resistor admittances
+        :param x: the solution vector
+        :return: an array of currents in the resistors (in the order of self.Resistors)
+        """
+        i = mna.BranchCurrents(y, x)
+        for r, ir in zip(self.Resistors, i):
+            r.Current = ir
+            r.DeltaV()
+        for v, iv in zip(self.VSources, mna.SourceCurrents(x)):
+            v.Current = iv
+        V = mna.NodeVoltages(x)
+        self.NodeVoltages = {n: V[k] for n, k in self.NodeIndex.items()}
+        return i
+
+    def SetResistance(self, name, R):
+        """
+        Changes the resistance of one resistor and, if the network was solved by AnalyzeCircuitMNA, updates the
+        solution incrementally.  Changing the admittance of a branch by d adds d * u * u^T to the MNA matrix A, so
+        with all changed branches gathered in U and D the Woodbury identity gives
+            x = x0 - Z (D^-1 + U^T Z)^-1 U^T x0,  Z = A^-1 U
+        which only needs one solve with the existing LU factors per changed resistor plus a small dense solve.
+        The network is refactorized once more than self.MaxLowRankUpdates resistors differ from the factorization.
+        :param name: the name of the resistor
+        :param R: the new resistance in Ohm
+        :return: an array of currents in the resistors, or None if the network has not been solved yet
+        """
+        found = self.LocateElement(*self.SplitName(name), kind='R')
+        if found is None:
+            print(f"Resistor '{name}' not found in the network.")
+            return None
+        k = found[1]
+        self.Resistors[k].Resistance = R
+        if self.Factorization is None:
+            return None
+        mna, lu, y0, x0 = self.Factorization
+        if k not in self.LowRankUpdates:
+            if len(self.LowRankUpdates) >= self.MaxLowRankUpdates:
+                return self.AnalyzeCircuitMNA(self.Ground)
+            u = mna.BranchVector(k)
+            self.LowRankUpdates[k] = (u, lu.solve(u))
+
+        y = y0.copy()
+        keys = list(self.LowRankUpdates)
+        y[keys] = [1.0 / self.Resistors[j].Resistance for j in keys]
+        d = y[keys] - y0[keys]
+        keep = d != 0.0  # resistors set back to their factorized value drop out of the update
+        keys = [j for j, kp in zip(keys, keep) if kp]
+        x = x0
+        if keys:
+            U = np.column_stack([self.LowRankUpdates[j][0] for j in keys])
+            Z = np.column_stack([self.LowRankUpdates[j][1] for j in keys])
+            C = np.diag(1.0 / d[keep]) + U.T @ Z
+            x = x0 - Z @ np.linalg.solve(C, U.T @ x0)
+        return self.StoreSolution(mna, y, x)
+
+    def AnalyzeCircuitIterative(self, ground=None, preconditioner='jacobi', tol=1e-10, maxIter=None):
+        """
+        Solves the network with the preconditioned conjugate gradient method on the SPD conductance Laplacian,
+        applied matrix free (see PCGSolver), for resistor grids too large to factorize.  Voltage sources must not
+        form loops among themselves.  The convergence report is kept in self.IterativeInfo.
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :param preconditioner: 'jacobi', 'amg' (needs pyamg) or None
+        :param tol: relative residual tolerance
+        :param maxIter: maximum number of CG iterations
+        :return: an array of currents in the resistors (in the order of self.Resistors)
+        """
+        self.CheckLinear('AnalyzeCircuitIterative')
+        nodes = self.GetNodeNames()
+        if ground is None:
+            ground = nodes[0]
+        index = {n: i for i, n in enumerate(nodes)}
+        rPairs = [self.SplitName(r.Name) for r in self.Resistors]
+        sPairs = [self.SplitName(v.Name) for v in self.VSources]
+        g = np.array([1.0 / r.Resistance for r in self.Resistors])
+        system = SupernodeLaplacian([index[a] for a, b in rPairs], [index[b] for a, b in rPairs], g,
+                                    [index[a] for a, b in sPairs], [index[b] for a, b in sPairs],
+                                    [v.Voltage for v in self.VSources], index[ground], len(nodes))
+        phi, self.IterativeInfo = SolvePCG(system, preconditioner, tol, maxIter)
+        if not self.IterativeInfo['converged']:
+            print("Warning: CG did not converge after {} iterations (relative residual {:0.3e})".format(
+                self.IterativeInfo['iterations'], self.IterativeInfo['residual']))
+        V = system.NodeVoltages(phi)
+        i = g * (V[system.N1] - V[system.N2])
+        for r, ir in zip(self.Resistors, i):
+            r.Current = ir
+            r.DeltaV()
+        for v, iv in zip(self.VSources, system.SourceCurrents(V)):
+            v.Current = iv
+        self.Ground = ground
+        self.NodeVoltages = {n: V[k] for n, k in index.items()}
+        return i
+
+    def AnalyzeCircuitReduced(self, ground=None, maxDegree=2, keep=()):
+        """
+        Solves the network by modified nodal analysis after a series/parallel reduction pre-pass (see
+        NetworkReduction), so long resistor chains and parallel banks do not inflate the system that is solved.
+        The voltages of the eliminated nodes are recovered afterwards and the currents are mapped back to every
+        original resistor, with the same sign conventions as AnalyzeCircuitMNA.
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :param maxDegree: 2 for series/parallel reduction only, 3 to also eliminate star (wye) nodes
+        :param keep: names of additional nodes that must not be eliminated
+        :return: an array of currents in the resistors (in the order of self.Resistors)
+        """
+        self.CheckLinear('AnalyzeCircuitReduced')
+        if ground is None:
+            ground = self.GetNodeNames()[0]
+        pairs = [self.SplitName(r.Name) for r in self.Resistors]
+        sPairs = [self.SplitName(v.Name) for v in self.VSources]
+        g = np.array([1.0 / r.Resistance for r in self.Resistors])
+        terminals = {n for p in sPairs for n in p} | {ground} | set(keep)
+        reduction = NetworkReduction(pairs, g, terminals, maxDegree)
+
+        rPairs, rG = reduction.ReducedBranches()
+        nodes = sorted({n for p in rPairs + sPairs for n in p} | {ground})
+        index = {n: i for i, n in enumerate(nn for nn in nodes if nn != ground)}
+        index[ground] = -1
+        mna = MNASystem([index[a] for a, b in rPairs], [index[b] for a, b in rPairs],
+                        [index[a] for a, b in sPairs], [index[b] for a, b in sPairs], len(nodes) - 1)
+        x = mna.Solve(rG, np.array([v.Voltage for v in self.VSources]))
+        Vr = mna.NodeVoltages(x)
+        V = {n: Vr[k] for n, k in index.items()}
+        for n in reduction.Nodes():
+            V.setdefault(n, 0.0)  # a terminal left without any branch is floating
+        reduction.RecoverVoltages(V)
+
+        i = g * np.array([V[a] - V[b] for a, b in pairs])
+        for r, ir in zip(self.Resistors, i):
+            r.Current = ir
+            r.DeltaV()
+        for v, iv in zip(self.VSources, mna.SourceCurrents(x)):
+            v.Current = iv
+        self.Ground = ground
+        self.NodeVoltages = V
+        return i
+
+    def GetTheveninEquivalent(self, nodeA, nodeB, ground=None):
+        """
+        The Thevenin equivalent of the network seen from two of its nodes.  The open circuit voltage comes from the
+        MNA solution with the sources in place, and the equivalent resistance from the voltage produced by a 1 A
+        test current injected at nodeA and drawn from nodeB with the sources turned off.  Both right hand sides
+        share one LU factorization.
+        :param nodeA: name of the positive terminal
+        :param nodeB: name of the negative terminal
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :return: a tuple (Vth, Rth) with Vth = V(nodeA) - V(nodeB) in volts and Rth in Ohm
+        """
+        self.CheckLinear('GetTheveninEquivalent')
+        mna = self.BuildMNASystem(ground)
+        y = np.array([1.0 / r.Resistance for r in self.Resistors])
+        b = np.zeros((mna.Size, 2))
+        b[:, 0] = mna.Rhs(np.array([v.Voltage for v in self.VSources]))
+        a, c = self.NodeIndex[nodeA], self.NodeIndex[nodeB]
+        if a >= 0:
+            b[a, 1] += 1.0
+        if c >= 0:
+            b[c, 1] -= 1.0
+        V = mna.NodeVoltages(mna.Factorize(y).solve(b))
+        Vth, Rth = V[a] - V[c]
+        return Vth, Rth
+
+    def GetNortonEquivalent(self, nodeA, nodeB, ground=None):
+        """
+        The Norton equivalent of the network seen from two of its nodes (see GetTheveninEquivalent).
+        :param nodeA: name of the positive terminal
+        :param nodeB: name of the negative terminal
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :return: a tuple (In, Rn) with the short circuit current In from nodeA to nodeB in amps and Rn in Ohm
+        """
+        Vth, Rth = self.GetTheveninEquivalent(nodeA, nodeB, ground)
+        return Vth / Rth, Rth
+
+    def AnalyzeAC(self, frequencies, ground=None):
+        """
+        Frequency sweep of the network with resistors, capacitors and inductors.  Resistors (1/R) and capacitors
+        (j*w*C) are MNA branches, while each inductor adds its current as an unknown with the branch equation
+        V1 - V2 - j*w*L*I = 0, so the whole system is linear in s = j*w: (G + s*C) x = b.  Sources of Type 'ac' are
+        the excitations, with amplitude Voltage and angle Phase (degrees), while the other sources are shorted
+        (0 V) as in small signal analysis; if no source is of Type 'ac' all sources are used as excitations.  All
+        frequencies are solved together from one Schur decomposition of the pencil (see SweepSolver.SolveSweep)
+        rather than one factorization per frequency.
+        :param frequencies: array of frequencies in Hz
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :return: a tuple (V, I) of complex arrays: V of shape (nFrequencies, number of nodes) with the node voltages
+                 in the order of self.ACNodes, and I of shape (nFrequencies, number of branches) with the branch
+                 currents in the order self.Resistors + self.Capacitors + self.Inductors
+        """
+        self.CheckLinear('AnalyzeAC')
+        omega = 2.0 * np.pi * np.atleast_1d(np.asarray(frequencies, dtype=float))
+        branches = self.Resistors + self.Capacitors
+        nodes = set()
+        for e in branches + self.Inductors + self.VSources:
+            nodes.update(self.SplitName(e.Name))
+        nodes = sorted(nodes)
+        if ground is None:
+            ground = nodes[0]
+        index = {n: i for i, n in enumerate(nn for nn in nodes if nn != ground)}
+        index[ground] = -1
+        bPairs = [self.SplitName(e.Name) for e in branches]
+        sPairs = [self.SplitName(v.Name) for v in self.VSources]
+        mna = MNASystem([index[a] for a, b in bPairs], [index[b] for a, b in bPairs],
+                        [index[a] for a, b in sPairs], [index[b] for a, b in sPairs], len(nodes) - 1)
+
+        # the pencil: conductances and source stamps in G, capacitances in C, then the inductor currents
+        nR, nC, nL = len(self.Resistors), len(self.Capacitors), len(self.Inductors)
+        g = np.concatenate([[1.0 / r.Resistance for r in self.Resistors], np.zeros(nC)])
+        c = np.concatenate([np.zeros(nR), [cap.Capacitance for cap in self.Capacitors]])
+        G, C = mna.Matrix(g), mna.BranchMatrix(c)
+        if nL > 0:
+            lPairs = [self.SplitName(L.Name) for L in self.Inductors]
+            rows = np.array([index[a] for a, b in lPairs] + [index[b] for a, b in lPairs])
+            cols = np.tile(np.arange(nL), 2)
+            vals = np.concatenate([np.ones(nL), -np.ones(nL)])
+            keep = rows >= 0
+            B = coo_matrix((vals[keep], (rows[keep], cols[keep])), shape=(mna.Size, nL))
+            G = bmat([[G, B], [B.T, None]])
+            C = bmat([[C, None], [None, diags([-L.Inductance for L in self.Inductors])]])
+
+        ac = [v.Type == 'ac' for v in self.VSources]
+        E = np.array([v.Voltage * np.exp(1j * np.radians(v.Phase)) if (a or not any(ac)) else 0.0
+                      for v, a in zip(self.VSources, ac)], dtype=complex)
+        b = np.concatenate([mna.Rhs(E), np.zeros(nL)])
+        X = SolveSweep(G, C, b, 1j * omega)
+        V = mna.NodeVoltages(X[:mna.Size])
+
+        # branch currents from the admittances of the elements, the inductor currents are unknowns
+        Y = np.empty((nR + nC, len(omega)), dtype=complex)
+        Y[:nR] = g[:nR, None]
+        for k, cap in enumerate(self.Capacitors):
+            Y[nR + k] = cap.Admittance(omega)
+        I = np.concatenate([mna.BranchCurrents(Y, X[:mna.Size]), X[mna.Size:]])
+        self.ACNodes = nodes
+        return V[[index[n] for n in nodes]].T, I.T
+
+    def AnalyzeCircuitBatch(self, R, V=None, ground=None):
+        """
+        Solves the network for many samples of resistances and source voltages, e.g., for a Monte Carlo tolerance
+        study.  The MNA system and its sparsity pattern are built once and shared by all samples (see
+        MNASystem.SolveBatch), and the elements of the network are left unchanged.
+        :param R: resistances, shape (nSamples, number of resistors) in the order of self.Resistors
+        :param V: optional source voltages, shape (nSamples, number of sources) in the order of self.VSources;
+                  the nominal voltages are used for every sample if omitted
+        :param ground: name of the reference node (defaults to the first node in alphabetical order)
+        :return: resistor currents, shape (nSamples, number of resistors)
+        """
+        self.CheckLinear('AnalyzeCircuitBatch')
+        R = np.atleast_2d(np.asarray(R, dtype=float))
+        if V is None:
+            V = np.tile([v.Voltage for v in self.VSources], (R.shape[0], 1))
+        V = np.atleast_2d(np.asarray(V, dtype=float))
+        mna = self.BuildMNASystem(ground)
+        Y = 1.0 / R.T
+        X = mna.SolveBatch(Y, V.T)
+        return mna.BranchCurrents(Y, X).T
+
+    def GetKirchoffVals(self, i):
+        """
+        This function uses Kirchoff Voltage and Current laws to analyze this specific circuit
+        KVL:  The net voltage drop for a closed loop in a circuit should be zero
+        KCL:  The net current flow into a node in a circuit should be zero
+        :param i: a list of currents relevant to the circuit
+        :return: a list of loop voltage drops and node currents
+        """
+        # set current in resistors in the top loop.
+        self.GetResistorByName('ad').Current = i[0]  # I_1 in diagram
+        self.GetResistorByName('bc').Current = i[0]  # I_1 in diagram
+        self.GetResistorByName('cd').Current = i[2]  # I_3 in diagram
+        # set current in resistor in bottom loop.
+        self.GetResistorByName('ce').Current = i[1]  # I_2 in diagram
+        # calculate net current into node c
+        Node_c_Current = sum([i[0], i[1], -i[2]])
+
+        KVL = self.GetLoopVoltageDrops()  # two equations here
+        KVL.append(Node_c_Current)  # one equation here
+        return KVL
+
+    def BuildRegistry(self):
+        """
+        Indexes the resistors and voltage sources by the unordered pair of nodes they connect, so that element
+        lookups by name take O(1) time instead of a scan over the element lists.
+        :return: the ElementRegistry
+        """
+        self.Registry = ElementRegistry()
+        for kind, elements in (('R', self.Resistors), ('V', self.VSources)):
+            for k, e in enumerate(elements):
+                n1, n2 = self.SplitName(e.Name)
+                self.Registry.Add(n1, n2, kind, k)
+        self.RegistrySignature = self.ElementSignature()
+        return self.Registry
+
+    def ElementSignature(self):
+        """
+        Identifies the elements of the network: the lists may be filled or edited by hand, so an element can be
+        replaced or renamed without changing how many there are.
+        :return: a tuple of (id, name) of every resistor and voltage source, in list order
+        """
+        return tuple((id(e), e.Name) for e in self.Resistors + self.VSources)
+
+    def UpdateRegistry(self):
+        """
+        Rebuilds the registry if any element was added, removed, replaced or renamed since it was built.
+        :return: the ElementRegistry
+        """
+        if self.RegistrySignature != self.ElementSignature():
+            self.BuildRegistry()
+        return self.Registry
+
+    def LocateElement(self, n1, n2, kind=None):
+        """
+        Looks up the element between two nodes in the registry in O(1).  A hit is confirmed against the element
+        now at that index, so the O(N) check of UpdateRegistry only runs when the lookup misses, the number of
+        elements changed, or the element found was replaced or renamed.
+        :param n1: the node traversal starts from
+        :param n2: the node traversal ends at
+        :param kind: optional 'R' or 'V' to restrict the search to one kind of element
+        :return: a tuple (kind, index, sign) as returned by ElementRegistry.Find, or None if there is no such element
+        """
+        if self.Registry.Count == len(self.Resistors) + len(self.VSources):
+            found = self.Registry.Find(n1, n2, kind)
+            if found is not None:
+                k, index, sign = found
+                elements = self.Resistors if k == 'R' else self.VSources
+                ends = (n1, n2) if sign > 0 else (n2, n1)
+                if index < len(elements) and self.SplitName(elements[index].Name) == ends:
+                    return found
+        self.UpdateRegistry()
+        return self.Registry.Find(n1, n2, kind)
+
+    def FindElement(self, n1, n2, kind=None):
+        """
+        Retrieves the element between two nodes from the registry (see LocateElement).
+        :param n1: the node traversal starts from
+        :param n2: the node traversal ends at
+        :param kind: optional 'R' or 'V' to restrict the search to one kind of element
+        :return: a tuple (element, sign) where sign is +1 if going from n1 to n2 follows the element's name
+                 order and -1 otherwise, or (None, 0) if there is no such element
+        """
+        found = self.LocateElement(n1, n2, kind)
+        if found is None:
+            return None, 0
+        k, index, sign = found
+        return (self.Resistors[index] if k == 'R' else self.VSources[index]), sign
+
+    def GetElementDeltaV(self, name):
+        """
+        Need to retrieve either a resistor or a voltage source by name.
+        :param name:
+        :return:
+        """
+        e, sign = self.FindElement(*self.SplitName(name))
+        if isinstance(e, Resistor):
+            return -e.DeltaV()
+        if isinstance(e, VoltageSource):
+            return sign * e.Voltage
+
+    def GetLoopVoltageDrops(self):
+        """
+        This calculates the net voltage drop around a closed loop in a circuit based on the
+        current flowing through resistors (cause a drop in voltage regardless of direction of traversal) or
+        the value of the voltage source that have been set up as positive based on the direction of traversal.
+        The loops are compiled into a signed loop-element matrix on first use, so the net voltage drops for all
+        loops are a single sparse matrix-vector product.
+        :return: net voltage drop for all loops in the network.
+        """
+        if self.LoopMatrix is None:
+            self.CompileLoops()
+        rise = np.concatenate([[-r.DeltaV() for r in self.Resistors], [v.Voltage for v in self.VSources]])
+        return list(self.LoopMatrix @ rise)
+
+    def CompileLoops(self):
+        """
+        Converts the node lists of hand written loops into element index and sign arrays and assembles the signed
+        loop-element matrix used by GetLoopVoltageDrops.  Loops built by BuildLoopsFromGraph are already compiled.
+        Following the convention of GetElementDeltaV, a resistor always contributes -I*R to a hand written loop
+        while a voltage source contributes +V or -V depending on the direction of traversal.
+        :return: nothing
+        """
+        self.UpdateRegistry()
+        nR = len(self.Resistors)
+        for L in self.Loops:
+            if len(L.Elements) == len(L.Nodes) > 0:
+                continue  # already compiled
+            elements = []
+            signs = []
+            for n in range(len(L.Nodes)):
+                kind, k, sgn = self.Registry.Find(L.Nodes[n], L.Nodes[(n + 1) % len(L.Nodes)])
+                elements.append(k if kind == 'R' else nR + k)
+                signs.append(1.0 if kind == 'R' else sgn)
+            L.Elements = np.array(elements, dtype=int)
+            L.Signs = np.array(signs)
+        self.AssembleLoopMatrix()
+
+    def AssembleLoopMatrix(self):
+        """
+        Assembles the sparse (loops x elements) matrix of loop signs from the compiled loops.
+        :return: nothing
+        """
+        rows = np.concatenate([np.full(len(L.Elements), j) for j, L in enumerate(self.Loops)] + [np.zeros(0, dtype=int)])
+        cols = np.concatenate([L.Elements for L in self.Loops] + [np.zeros(0, dtype=int)])
+        vals = np.concatenate([L.Signs for L in self.Loops] + [np.zeros(0)])
+        shape = (len(self.Loops), len(self.Resistors) + len(self.VSources))
+        self.LoopMatrix = csr_matrix((vals, (rows, cols)), shape=shape)
+
+    def BuildLoopsFromGraph(self):
+        """
+        Replaces self.Loops with a minimal set of independent loops found from the node pairs of the resistors and
+        voltage sources (a spanning tree plus one fundamental loop per remaining element), so no loops have to
+        be written in the network file.  Unlike hand written loops, the sign of each resistor follows the
+        direction of traversal: a resistor traversed from its first to its second node contributes -I*R, with
+        the current positive from the first to the second node as in AnalyzeCircuitMNA.
+        :return: the list of loops
+        """
+        elements = self.Resistors + self.VSources
+        pairs = [self.SplitName(e.Name) for e in elements]
+        self.Loops = []
+        for j, (edges, signs, nodes) in enumerate(FindFundamentalLoops(pairs)):
+            L = Loop()
+            L.Name = 'L{}'.format(j + 1)
+            L.Nodes = nodes
+            L.Elements = edges
+            L.Signs = signs
+            self.Loops.append(L)
+        self.AssembleLoopMatrix()
+        return self.Loops
+
+    def GetResistorByName(self, name):
+        """
+        A way to retrieve a resistor object from self.Resistors based on resistor name
+        :param name:
+        :return:
+        """
+        r, sign = self.FindElement(*self.SplitName(name), kind='R')
+        if r is not None:
+            return r
+        print(f"Resistor '{name}' not found in the network.")  # Debug statement
+        return None
+    #endregion
+
+class ResistorNetwork_2(ResistorNetwork):
+    #region constructor
+    def __init__(self):
+        super().__init__()  # runs the constructor of the parent class
+        #region attributes
+        #endregion
+    #endregion
+
+    #region methods
+    def AnalyzeCircuit(self):
+        """
+        Override AnalyzeCircuit for the second circuit.
+        """
+        i0 = [1.0, 1.0, 1.0]  # define an initial guess for the currents in the circuit
+        i = fsolve(self.GetKirchoffVals, i0)
+        # print output to the screen
+        print("I1 = {:0.1f}".format(i[0]))
+        print("I2 = {:0.1f}".format(i[1]))
+        print("I3 = {:0.1f}".format(i[2]))
+        return i
+
+    def GetKirchoffVals(self, i):
+        """
+        Override GetKirchoffVals for the second circuit.
+        """
+        # set current in resistors in the top loop.
+        self.GetResistorByName('ad').Current = i[0]  # I_1 in diagram
+        self.GetResistorByName('bc').Current = i[0]  # I_1 in diagram
+        self.GetResistorByName('cd').Current = i[2]  # I_3 in diagram
+        # set current in resistor in bottom loop.
+        self.GetResistorByName('ce').Current = i[1]  # I_2 in diagram
+        # calculate net current into node c
+        Node_c_Current = sum([i[0], i[1], -i[2]])
+
+        KVL = self.GetLoopVoltageDrops()  # two equations here
+        KVL.append(Node_c_Current)  # one equation here
+        return KVL
+    #endregion
 #endregion
\ No newline at end of file
@@ -0,0 +1,83 @@
+#region imports
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve, schur
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+#endregion
+
+#region function definitions
+def RealTimes(A, Z):
+    """
+    The product A @ Z of a real matrix (or vector) and a complex matrix with contiguous rows, done in real
+    arithmetic on a float view of Z, which takes half the flops of converting A to complex.
+    :param A: real array, shape (m, k) or (k,)
+    :param Z: C contiguous complex array, shape (k, nColumns)
+    :return: the complex product, shape (m, nColumns) or (nColumns,)
+    """
+    return (A @ Z.view(float)).view(complex)
+
+
+def SolveSweep(G, C, b, s, blockSize=64, chunkBytes=2**27, tol=1e-8):
+    """
+    Solves the real linear pencil (G + s*C) x = b for many values of s, e.g. the complex MNA system of an RLC
+    network over a frequency sweep with s = j*w.  Instead of one sparse LU per value of s, the pencil is shifted to
+    a positive real s0, where a passive network is never singular, and reduced once to quasi triangular form:
+        G + s*C = (G + s0*C) (I + (s - s0) M),  M = (G + s0*C)^-1 C = Q T Q^T  (real Schur form)
+    so that x = Q z with (I + (s - s0) T) z = Q^T (G + s0*C)^-1 b.  The triangular systems of all values of s are
+    solved together by blocked back substitution, with matrix products across the sweep, so after the O(n^3)
+    decomposition every value of s costs O(n^2) in BLAS.  Values of s whose backward error exceeds tol, if any,
+    are solved again with a sparse LU of their own.
+    :param G: the constant part of the matrix, real scipy.sparse (n x n)
+    :param C: the part proportional to s, real scipy.sparse (n x n)
+    :param b: the right hand side, a (complex) vector of length n
+    :param s: array of the values of s
+    :param blockSize: number of rows of each block of the back substitution
+    :param chunkBytes: approximate memory limit for the solutions of one chunk of values of s
+    :param tol: largest acceptable backward error |b - (G + s*C) x| / (|G + s*C| |x| + |b|), in the 1-norm
+    :return: the solutions, shape (n, number of values of s)
+    """
+    G, C = csc_matrix(G, dtype=float), csc_matrix(C, dtype=float)
+    b = np.asarray(b, dtype=complex)
+    s = np.atleast_1d(np.asarray(s, dtype=complex))
+    n = G.shape[0]
+    s0 = max(float(np.median(np.abs(s))), 1.0e-12)
+    F = lu_factor((G + s0 * C).toarray())
+    T, Q = schur(lu_solve(F, C.toarray()), output='real')
+    c = lu_solve(F, np.column_stack([b.real, b.imag]))
+    d = Q.T @ (c[:, 0] + 1j * c[:, 1])
+    pair = np.concatenate([[False], np.diag(T, -1) != 0.0])  # pair[k]: rows k-1 and k form a 2 x 2 block of T
+
+    X = np.empty((n, len(s)), dtype=complex)
+    chunk = max(1, chunkBytes // (16 * n))
+    for start in range(0, len(s), chunk):
+        t = s[start:start + chunk] - s0
+        Z = np.tile(d[:, None], (1, len(t)))  # right hand sides, overwritten by the solution from the bottom up
+        hi = n
+        while hi > 0:
+            lo = max(0, hi - blockSize)
+            lo -= int(pair[lo])  # a block of rows never splits a 2 x 2 block
+            k = hi - 1
+            while k >= lo:
+                if pair[k]:
+                    j = k - 1
+                    r = Z[j:k + 1] - t * RealTimes(T[j:k + 1, k + 1:hi], Z[k + 1:hi])
+                    a11, a12 = 1.0 + t * T[j, j], t * T[j, k]
+                    a21, a22 = t * T[k, j], 1.0 + t * T[k, k]
+                    det = a11 * a22 - a12 * a21
+                    Z[j], Z[k] = (a22 * r[0] - a12 * r[1]) / det, (a11 * r[1] - a21 * r[0]) / det
+                    k -= 2
+                else:
+                    Z[k] = (Z[k] - t * RealTimes(T[k, k + 1:hi], Z[k + 1:hi])) / (1.0 + t * T[k, k])
+                    k -= 1
+            Z[:lo] -= RealTimes(T[:lo, lo:hi], Z[lo:hi]) * t
+            hi = lo
+        X[:, start:start + chunk] = RealTimes(Q, Z)
+
+    # backward error of every value of s, anything inaccurate is solved directly
+    R = b[:, None] - G @ X - (C @ X) * s
+    normA = abs(G).sum(axis=0).max() + np.abs(s) * abs(C).sum(axis=0).max()
+    err = np.abs(R).sum(axis=0) / (normA * np.abs(X).sum(axis=0) + np.abs(b).sum())
+    for k in np.flatnonzero(~(err <= tol)):
+        X[:, k] = splu((G + s[k] * C).tocsc().astype(complex)).solve(b)
+    return X
+#endregion
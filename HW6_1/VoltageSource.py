@@ -1,15 +1,20 @@
-#region class definitions
-class VoltageSource():
-    #region constructor
-    def __init__(self, V=12.0, name='ab'):
-        """
-        Define a voltage source in terms of self.Voltage = V, self.Name = name
-        :param V: The voltage
-        :param name: the name of voltage source
-        """
-        #region attributes
-        self.Voltage = V
-        self.Name=name
-        #endregion
-    #endregion
+#region class definitions
+class VoltageSource():
+    #region constructor
+    def __init__(self, V=12.0, name='ab', vType='voltage', phase=0.0):
+        """
+        Define a voltage source in terms of self.Voltage = V, self.Name = name
+        :param V: The voltage
+        :param name: the name of voltage source
+        :param vType: the type of source as given in the network file ('ac' for an AC analysis excitation)
+        :param phase: phase angle of an AC source in degrees
+        """
+        #region attributes
+        self.Voltage = V
+        self.Name=name
+        self.Type = vType
+        self.Phase = phase
+        self.Current = 0.0  # current through the source from its first to its second node
+        #endregion
+    #endregion
 #endregion
\ No newline at end of file
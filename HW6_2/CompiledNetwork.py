@@ -0,0 +1,125 @@
+# region imports
+import numpy as np
+from scipy.sparse import coo_matrix
+from GGASolver import headLoss
+# endregion
+
+# region class definitions
+class CompiledNetwork():
+    # region constructor
+    def __init__(self, pipes, nodes, loops=None, g=9.81):
+        '''
+        A frozen, struct-of-arrays copy of a pipe network for fast residual evaluation.  Every pipe property a
+        solve needs is gathered once into a contiguous numpy array, so velocities, Reynolds numbers, head losses,
+        node continuity and loop head losses are whole-array operations instead of per-pipe method calls.  The
+        Pipe and Node objects are only touched again by writeBack, at the end of a solve.
+        :param pipes: a list of Pipe objects
+        :param nodes: a list of Node objects (every pipe end must be one of them)
+        :param loops: an optional list of Loop objects
+        :param g: gravitational acceleration in m/s^2
+        '''
+        # region attributes
+        self.pipes = list(pipes)
+        self.nodes = list(nodes)
+        number = {n.name: i for i, n in enumerate(self.nodes)}
+        self.start = np.array([number[p.startNode] for p in self.pipes], dtype=int)
+        self.end = np.array([number[p.endNode] for p in self.pipes], dtype=int)
+        self.length = np.array([p.length for p in self.pipes], dtype=float)
+        self.d = np.array([p.d for p in self.pipes], dtype=float)  # diameter in m
+        self.area = np.array([p.A for p in self.pipes], dtype=float)  # m^2
+        self.relrough = np.array([p.relrough for p in self.pipes], dtype=float)
+        self.nu = np.array([p.fluid.mu / p.fluid.rho for p in self.pipes], dtype=float)  # kinematic viscosity
+        self.LoverD = self.length / self.d
+        self.invTwoGA2 = 1.0 / (2.0 * g * self.area**2)
+        # hl = f * K * Q|Q| with Q in L/s, and Re = alpha * |Q| (see GGASolver.headLoss)
+        self.K = self.LoverD * self.invTwoGA2 / 1000.0**2
+        self.alpha = self.d / (1000.0 * self.area * self.nu)
+        self.extFlow = np.array([n.extFlow for n in self.nodes], dtype=float)
+        # signed node-pipe incidence matrix, -1 at the start node and +1 at the end node of each pipe
+        P = len(self.pipes)
+        rows = np.r_[self.start, self.end]
+        cols = np.r_[np.arange(P), np.arange(P)]
+        vals = np.r_[-np.ones(P), np.ones(P)]
+        self.incidence = coo_matrix((vals, (rows, cols)), shape=(len(self.nodes), P)).tocsr()
+        self.loopMatrix = self.buildLoopMatrix(loops if loops is not None else [])
+        # endregion
+    # endregion
+
+    # region methods
+    def buildLoopMatrix(self, loops):
+        '''
+        Builds the signed loop-pipe matrix: +1 where a loop traverses a pipe in its positive direction (start node
+        to end node) and -1 where it traverses it backwards, following the traversal rules of Loop.getLoopHeadLoss.
+        :param loops: a list of Loop objects
+        :return: a scipy.sparse csr_matrix of shape (number of loops, number of pipes)
+        '''
+        column = {id(p): i for i, p in enumerate(self.pipes)}
+        rows, cols, vals = [], [], []
+        for l, loop in enumerate(loops):
+            if not loop.pipes:
+                continue
+            node = loop.pipes[0].startNode
+            for p in loop.pipes:
+                rows.append(l)
+                cols.append(column[id(p)])
+                vals.append(1.0 if node == p.startNode else -1.0)
+                node = p.endNode if node != p.endNode else p.startNode
+        return coo_matrix((vals, (rows, cols)), shape=(len(loops), len(self.pipes))).tocsr()
+
+    def velocity(self, Q):
+        '''
+        :param Q: array of pipe flow rates in L/s
+        :return: array of average velocities in m/s
+        '''
+        return (Q / 1000.0) / self.area
+
+    def reynolds(self, Q):
+        '''
+        :param Q: array of pipe flow rates in L/s
+        :return: array of Reynolds numbers (of the speed of the flow)
+        '''
+        return self.alpha * np.abs(Q)
+
+    def headLoss(self, Q, model='smooth', z=None):
+        '''
+        Darcy-Weisbach head losses and their derivatives for every pipe (see GGASolver.headLoss).
+        :param Q: array of pipe flow rates in L/s
+        :param model: transitional friction model (see Friction.frictionFactor)
+        :param z: array of standard normal deviates for the 'stochastic' and 'tapered' models
+        :return: a tuple (hl, dhl) of signed head losses in m and their derivatives in m/(L/s)
+        '''
+        return headLoss(Q, self.K, self.alpha, self.relrough, model, z)
+
+    def nodeFlowRates(self, Q):
+        '''
+        :param Q: array of pipe flow rates in L/s
+        :return: array of the net flow rate into every node in L/s, A @ Q + extFlow
+        '''
+        return self.incidence @ Q + self.extFlow
+
+    def loopHeadLosses(self, Q, model='smooth', z=None):
+        '''
+        :param Q: array of pipe flow rates in L/s
+        :param model: transitional friction model (see Friction.frictionFactor)
+        :param z: array of standard normal deviates for the 'stochastic' and 'tapered' models
+        :return: array of the net head loss around every loop in m
+        '''
+        return self.loopMatrix @ self.headLoss(Q, model, z)[0]
+
+    def writeBack(self, Q, H=None):
+        '''
+        Stores a solution on the Pipe objects (flow rate, velocity and Reynolds number) and, optionally, the
+        heads on the Node objects.
+        :param Q: array of pipe flow rates in L/s
+        :param H: optional array of node heads in m
+        :return: nothing
+        '''
+        for p, q in zip(self.pipes, Q):
+            p.Q = float(q)
+            p.V()
+            p.Re()
+        if H is not None:
+            for n, h in zip(self.nodes, H):
+                n.head = float(h)
+    # endregion
+# endregion
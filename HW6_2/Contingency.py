@@ -0,0 +1,100 @@
+# region imports
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from GGASolver import solveGGA
+# endregion
+
+# region constants
+# one row of the summary table of analyzeOutages
+SUMMARY_DTYPE = np.dtype([('pipe', np.int64),  # index of the pipe taken out of service
+                          ('feasible', bool),  # False if the outage cuts off nodes with demand
+                          ('converged', bool),
+                          ('iterations', np.int64),
+                          ('isolated', np.int64),  # number of nodes cut off from the reference node
+                          ('minFlow', float),  # smallest flow magnitude in the pipes still in service, L/s
+                          ('minFlowPipe', np.int64),  # index of that pipe
+                          ('minHead', float),  # lowest head of a supplied node, m relative to the reference node
+                          ('minHeadNode', np.int64)])  # index of that node
+# endregion
+
+# region function definitions
+# arrays of the base network, shipped to every worker process once by initWorker
+base = None
+
+
+def initWorker(network):
+    '''
+    Stores the arrays of the base network in a worker process, so that every task only needs a pipe index.
+    :param network: a dictionary with the arrays 'start', 'end', 'K', 'alpha', 'relrough', 'extFlow' and 'Q0', and
+                    the settings 'refNode', 'tol', 'maxIter' and 'model'
+    :return: nothing
+    '''
+    global base
+    base = network
+
+
+def solveOutage(k, network=None, feasibilityTol=1e-9):
+    '''
+    Solves the network with pipe k out of service.  Nodes that the outage cuts off from the reference node can not
+    be supplied, so the case is infeasible if any of them has an external flow; otherwise they are dropped and the
+    rest of the network is solved with the Global Gradient Algorithm, warm started from the base case flows.
+    :param k: index of the pipe taken out of service
+    :param network: the arrays of the base network (see initWorker), defaults to those of the worker process
+    :param feasibilityTol: external flows below this magnitude in L/s are treated as zero
+    :return: a tuple with the fields of SUMMARY_DTYPE
+    '''
+    net = network if network is not None else base
+    start, end = net['start'], net['end']
+    nNodes = len(net['extFlow'])
+    ref = net['refNode'] % nNodes
+    keep = np.ones(len(start), dtype=bool)
+    keep[k] = False
+    graph = coo_matrix((np.ones(keep.sum()), (start[keep], end[keep])), shape=(nNodes, nNodes))
+    nComp, label = connected_components(graph, directed=False)
+    supplied = label == label[ref]
+    isolated = int(nNodes - supplied.sum())
+    if np.any(np.abs(net['extFlow'][~supplied]) > feasibilityTol):
+        return (k, False, False, 0, isolated, np.nan, -1, np.nan, -1)
+
+    # the sub network of the pipes still in service between supplied nodes
+    pipes = np.flatnonzero(keep & supplied[start])
+    nodes = np.flatnonzero(supplied)
+    number = -np.ones(nNodes, dtype=int)
+    number[nodes] = np.arange(len(nodes))
+    P = len(pipes)
+    rows = np.r_[number[start[pipes]], number[end[pipes]]]
+    A = coo_matrix((np.r_[-np.ones(P), np.ones(P)], (rows, np.r_[np.arange(P), np.arange(P)])),
+                   shape=(len(nodes), P)).tocsr()
+    Q, H, info = solveGGA(A, net['K'][pipes], net['alpha'][pipes], net['relrough'][pipes], net['extFlow'][nodes],
+                          number[ref], net['Q0'][pipes], net['tol'], net['maxIter'], net['model'])
+    i = int(np.argmin(np.abs(Q))) if P > 0 else -1
+    j = int(np.argmin(H))
+    return (k, True, info['converged'], info['iterations'], isolated, abs(Q[i]) if P > 0 else np.nan,
+            pipes[i] if P > 0 else -1, H[j], nodes[j])
+
+
+def analyzeOutages(network, outages, maxWorkers=None, chunksize=None):
+    '''
+    N-1 contingency analysis: solves the network once for every pipe in outages taken out of service, in parallel
+    on a process pool.  The base network travels to each worker once, as a dictionary of numpy arrays (see
+    initWorker), and every task is just a pipe index, so no object graphs are pickled.
+    :param network: the arrays of the base network (see initWorker)
+    :param outages: a list of pipe indices to take out of service one at a time
+    :param maxWorkers: number of worker processes (defaults to the number of cores); 0 or 1 solves in this process
+    :param chunksize: number of outages sent to a worker at once (defaults to an even split in 4 chunks per worker)
+    :return: a numpy structured array with dtype SUMMARY_DTYPE, one row per outage in the order of outages
+    '''
+    outages = [int(k) for k in outages]
+    workers = (os.cpu_count() or 1) if maxWorkers is None else maxWorkers
+    if workers <= 1 or len(outages) <= 1:
+        rows = [solveOutage(k, network) for k in outages]
+    else:
+        if chunksize is None:
+            chunksize = max(1, len(outages) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=initWorker, initargs=(network,)) as pool:
+            rows = list(pool.map(solveOutage, outages, chunksize=chunksize))
+    return np.array(rows, dtype=SUMMARY_DTYPE)
+# endregion
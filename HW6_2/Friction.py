@@ -0,0 +1,147 @@
+# region imports
+import numpy as np
+# endregion
+
+# region constants
+MODELS = ('smooth', 'linear', 'stochastic', 'tapered')  # friction models for transitional flow
+RANDOM_MODELS = ('stochastic', 'tapered')  # the models that need normal deviates
+# endregion
+
+# region function definitions
+def swameeJain(Re, relrough):
+    '''
+    Explicit Swamee-Jain approximation of the Colebrook friction factor (within about 3.5% of Colebrook for
+    4000 <= Re <= 1e8 and relrough <= 0.05, and closer at higher Reynolds numbers).
+    :param Re: array of Reynolds numbers
+    :param relrough: array of relative roughness (roughness / diameter)
+    :return: array of (Darcy) friction factors
+    '''
+    Re = np.asarray(Re, dtype=float)
+    return 0.25 / np.log10(relrough / 3.7 + 5.74 / Re**0.9)**2
+
+
+def colebrook(Re, relrough, iterations=3):
+    '''
+    Solves the Colebrook equation  1/sqrt(f) = -2 log10(relrough/3.7 + 2.51/(Re sqrt(f)))  for every pipe at once.
+    Writing x = 1/sqrt(f), the residual g(x) = x + 2 log10(relrough/3.7 + 2.51 x/Re) is smooth and nearly linear, so
+    Newton's method seeded with Swamee-Jain converges quadratically.  Checked against fsolve over
+    4000 <= Re <= 1e8 and 0 <= relrough <= 0.05, the largest relative difference in f is 1.4e-5 after 1 step,
+    4.6e-12 after 2 steps and 1.0e-15 after 3 steps (the default).  Against fsolve with its default tolerance, as
+    previously used in Pipe.FrictionFactor, the largest difference is 7.6e-14, within the tolerance of fsolve.
+    :param Re: array of Reynolds numbers (the magnitude is used)
+    :param relrough: array of relative roughness (roughness / diameter)
+    :param iterations: number of Newton refinements of the Swamee-Jain seed
+    :return: array of (Darcy) friction factors
+    '''
+    Re = np.abs(np.asarray(Re, dtype=float))
+    rr = np.asarray(relrough)
+    rr = rr.astype(np.result_type(rr, float))  # may be complex, see frictionRoughnessDerivative
+    x = 1.0 / np.sqrt(swameeJain(Re, rr))
+    c = 2.0 / np.log(10.0)
+    for i in range(iterations):
+        arg = rr / 3.7 + 2.51 * x / Re
+        g = x + c * np.log(arg)
+        dg = 1.0 + c * (2.51 / Re) / arg
+        x = x - g / dg
+    return 1.0 / x**2
+
+
+def colebrookDerivative(Re, relrough, f):
+    '''
+    Derivative of the Colebrook friction factor with respect to the Reynolds number, from the implicit function
+    theorem on g(x, Re) = x + c ln(rr/3.7 + 2.51 x/Re) = 0 with x = 1/sqrt(f) and c = 2/ln(10).
+    :param Re: array of Reynolds numbers (> 0)
+    :param relrough: array of relative roughness
+    :param f: array of Colebrook friction factors at Re (see colebrook)
+    :return: array of df/dRe
+    '''
+    x = 1.0 / np.sqrt(f)
+    c = 2.0 / np.log(10.0)
+    arg = relrough / 3.7 + 2.51 * x / Re
+    dxdRe = (c * 2.51 * x / Re**2 / arg) / (1.0 + c * (2.51 / Re) / arg)
+    return -2.0 * dxdRe / x**3
+
+
+def frictionFactor(Re, relrough, model='smooth', z=None):
+    '''
+    Deterministic (Darcy) friction factor and its analytic derivative with respect to the Reynolds number for every
+    pipe at once.  Laminar flow (Re <= 2000) uses 64/Re and turbulent flow (Re >= 4000) uses Colebrook.  For the
+    transitional range the model is one of:
+        'smooth'     a cubic Hermite blend in Re matching the value and slope of 64/Re at Re=2000 and of Colebrook
+                     at Re=4000, so f is C1 continuous and Newton type solvers see consistent derivatives
+        'linear'     the Re-weighted mean of the two, laminar at Re=2000 to Colebrook at Re=4000 (continuous, but
+                     with kinks at both ends); this is the mean Pipe.FrictionFactor used to draw around
+        'stochastic' the original Monte Carlo model: the 'linear' mean scaled by (1 + 0.2 z), for given standard
+                     normal deviates z, i.e., a normal draw with a standard deviation of 20% of the mean
+        'tapered'    the 'smooth' blend scaled by (1 + 0.2 z b), where the bump b = 16 t^2 (1-t)^2 with
+                     t = (Re-2000)/2000 rises from 0 at both ends to 1 at Re=3000, so the standard deviation is 20%
+                     mid-band yet f stays C1
+    With z held fixed during a solve every Monte Carlo sample is a deterministic problem.
+    :param Re: array of Reynolds numbers (the magnitude is used, and must be > 0)
+    :param relrough: array of relative roughness (roughness / diameter)
+    :param model: 'smooth', 'linear', 'stochastic' or 'tapered'
+    :param z: array of standard normal deviates, one per pipe (needed for the 'stochastic' and 'tapered' models)
+    :return: a tuple (f, dfdRe) of arrays
+    '''
+    if model not in MODELS:
+        raise ValueError("Unknown friction model '{}'".format(model))
+    if model in RANDOM_MODELS and z is None:
+        raise ValueError("The '{}' friction model needs the normal deviates z".format(model))
+    Re = np.abs(np.asarray(Re, dtype=float))
+    rr = np.asarray(relrough)
+    rr = np.broadcast_to(rr.astype(np.result_type(rr, float)), Re.shape)  # complex for frictionRoughnessDerivative
+    f = np.empty(Re.shape, dtype=rr.dtype)
+    df = np.empty(Re.shape, dtype=rr.dtype)
+    lam = Re <= 2000.0
+    f[lam] = 64.0 / Re[lam]
+    df[lam] = -64.0 / Re[lam]**2
+    turb = Re >= 4000.0
+    f[turb] = colebrook(Re[turb], rr[turb])
+    df[turb] = colebrookDerivative(Re[turb], rr[turb], f[turb])
+    trans = ~(lam | turb)
+    if np.any(trans):
+        R, r = Re[trans], rr[trans]
+        t = (R - 2000.0) / 2000.0
+        if model in ('smooth', 'tapered'):
+            # Hermite end conditions: value and slope of 64/Re at Re=2000 and of Colebrook at Re=4000
+            fL, dfL = 64.0 / 2000.0, -64.0 / 2000.0**2
+            fT = colebrook(np.full_like(R, 4000.0), r)
+            dfT = colebrookDerivative(4000.0, r, fT)
+            h00, h10, h01, h11 = 2*t**3 - 3*t**2 + 1, t**3 - 2*t**2 + t, -2*t**3 + 3*t**2, t**3 - t**2
+            d00, d10, d01, d11 = 6*t**2 - 6*t, 3*t**2 - 4*t + 1, -6*t**2 + 6*t, 3*t**2 - 2*t
+            ft = h00 * fL + h10 * 2000.0 * dfL + h01 * fT + h11 * 2000.0 * dfT
+            dft = (d00 * fL + d01 * fT) / 2000.0 + d10 * dfL + d11 * dfT
+            if model == 'tapered':
+                a = 0.2 * np.broadcast_to(np.asarray(z, dtype=float), Re.shape)[trans]
+                b, db = 16.0 * t**2 * (1.0 - t)**2, 32.0 * t * (1.0 - t) * (1.0 - 2.0 * t) / 2000.0
+                ft, dft = ft * (1.0 + a * b), dft * (1.0 + a * b) + ft * a * db
+        else:
+            fL, dfL = 64.0 / R, -64.0 / R**2
+            fT = colebrook(R, r)
+            dfT = colebrookDerivative(R, r, fT)
+            ft = fL + t * (fT - fL)
+            dft = dfL + (fT - fL) / 2000.0 + t * (dfT - dfL)
+            if model == 'stochastic':
+                a = 1.0 + 0.2 * np.broadcast_to(np.asarray(z, dtype=float), Re.shape)[trans]
+                ft, dft = ft * a, dft * a
+        f[trans] = ft
+        df[trans] = dft
+    return f, df
+
+
+def frictionRoughnessDerivative(Re, relrough, model='smooth', z=None):
+    '''
+    Derivative of the friction factor of frictionFactor with respect to the relative roughness, by the complex step
+    method: every operation in frictionFactor is analytic in the relative roughness, so for a tiny step h the
+    imaginary part of f(rr + i h) / h is the derivative to machine precision, with no subtractive cancellation.
+    This covers the implicit Colebrook solve and the Hermite end conditions of the 'smooth' model alike.
+    :param Re: array of Reynolds numbers (the magnitude is used, and must be > 0)
+    :param relrough: array of relative roughness (roughness / diameter)
+    :param model: 'smooth', 'linear', 'stochastic' or 'tapered'
+    :param z: array of standard normal deviates, one per pipe (needed for the 'stochastic' and 'tapered' models)
+    :return: array of df/drelrough (zero for laminar flow)
+    '''
+    h = 1.0e-30
+    f, df = frictionFactor(Re, np.asarray(relrough, dtype=float) + 1j * h, model, z)
+    return f.imag / h
+# endregion
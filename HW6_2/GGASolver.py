@@ -0,0 +1,83 @@
+# region imports
+import numpy as np
+from scipy.sparse import diags
+from scipy.sparse.linalg import splu
+from Friction import frictionFactor
+# endregion
+
+# region function definitions
+def headLoss(Q, K, alpha, relrough, model='smooth', z=None):
+    '''
+    Darcy-Weisbach head loss and its analytic derivative for every pipe.  With V = Q/(1000 A) and Re = alpha*|Q|,
+    hl = f(Re) * K * Q*|Q| where K = (L/d) / (2 g (1000 A)^2).  Since K*Q^2 = K*Re^2/alpha^2, the derivative is
+    d(hl)/dQ = K/alpha * (Re^2 f'(Re) + 2 Re f(Re)), which stays finite as Q -> 0 (laminar flow gives 64 K/alpha).
+    :param Q: array of pipe flow rates in L/s
+    :param K: array of head loss coefficients (L/d)/(2 g (1000 A)^2)
+    :param alpha: array of Reynolds number per unit flow rate d/(1000 A nu)
+    :param relrough: array of relative roughness
+    :param model: transitional friction model (see Friction.frictionFactor)
+    :param z: array of standard normal deviates for the 'stochastic' and 'tapered' models
+    :return: a tuple (hl, dhl) of the signed head losses in m and their derivatives in m/(L/s)
+    '''
+    q = np.abs(Q)
+    Re = np.maximum(alpha * q, 1.0e-6)  # a tiny floor keeps 64/Re finite at zero flow
+    f, df = frictionFactor(Re, relrough, model, z)
+    hl = f * K * Q * q
+    dhl = K / alpha * (Re**2 * df + 2.0 * Re * f)
+    return hl, dhl
+
+
+def solveGGA(A, K, alpha, relrough, extFlow, refNode=-1, Q0=None, tol=1e-8, maxIter=50, model='smooth', z=None):
+    '''
+    Global Gradient Algorithm (Todini-Pilati) for the flows Q and heads H of a pipe network.  With the signed
+    node-pipe incidence matrix A (-1 at the start node and +1 at the end node of each pipe) the equations are
+        energy:      hl(Q) + A^T H = 0       (H_start - H_end = hl for every pipe)
+        continuity:  A Q + extFlow = 0       (net flow into every node but the reference node)
+    Newton's method on this saddle point system, with D = diag(d hl/dQ), reduces each iteration to one sparse
+    symmetric positive definite solve for the head corrections,
+        (A D^-1 A^T) dH = r_c - A D^-1 r_e,    dQ = -D^-1 (r_e + A^T dH)
+    followed by the flow corrections.  No loops are needed.  The head of the reference node is fixed at 0, so it
+    acts as a reservoir that takes up any imbalance of the external flows.
+    :param A: scipy.sparse incidence matrix (nodes x pipes)
+    :param K: array of head loss coefficients of the pipes (see headLoss)
+    :param alpha: array of Reynolds number per unit flow rate of the pipes (see headLoss)
+    :param relrough: array of relative roughness of the pipes
+    :param extFlow: array of external flows into the nodes in L/s
+    :param refNode: index of the reference (fixed head) node
+    :param Q0: optional initial flow rates in L/s (by default 10 L/s in every pipe, as in Pipe)
+    :param tol: convergence tolerance on the flow corrections in L/s and the residuals
+    :param maxIter: maximum number of iterations
+    :param model: transitional friction model (see Friction.frictionFactor)
+    :param z: array of standard normal deviates for the 'stochastic' and 'tapered' models, held fixed during the
+              solve
+    :return: a tuple (Q, H, info) with the pipe flows in L/s, the node heads in m relative to the reference node,
+             and a dictionary with 'converged' and 'iterations'
+    '''
+    nNodes = A.shape[0]
+    keep = np.ones(nNodes, dtype=bool)
+    keep[refNode] = False
+    Ar = A.tocsr()[keep]
+    ArT = Ar.T.tocsr()
+    ext = np.asarray(extFlow, dtype=float)[keep]
+    Q = np.asarray(Q0, dtype=float).copy() if Q0 is not None else np.full(len(K), 10.0)
+    H = np.zeros(Ar.shape[0])
+    converged = False
+    for iteration in range(1, maxIter + 1):
+        hl, D = headLoss(Q, K, alpha, relrough, model, z)
+        rE = hl + ArT @ H
+        rC = Ar @ Q + ext
+        Dinv = diags(1.0 / D)
+        S = (Ar @ Dinv @ ArT).tocsc()
+        # S is symmetric positive definite: a symmetric fill reducing ordering and no pivoting are enough
+        lu = splu(S, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+        dH = lu.solve(rC - Ar @ (rE / D))
+        dQ = -(rE + ArT @ dH) / D
+        Q += dQ
+        H += dH
+        if np.abs(dQ).max() < tol and np.abs(rC).max() < tol:
+            converged = True
+            break
+    Hfull = np.zeros(nNodes)
+    Hfull[keep] = H
+    return Q, Hfull, {'converged': converged, 'iterations': iteration}
+# endregion
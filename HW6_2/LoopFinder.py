@@ -0,0 +1,115 @@
+# region imports
+from collections import deque
+import numpy as np
+from scipy.sparse import coo_matrix
+# endregion
+
+# region function definitions
+def spanningTree(start, end, nNodes, root=-1):
+    '''
+    Grows a breadth first spanning tree (forest if the network is not connected) over the pipe graph, beginning
+    with the root node.
+    :param start: int array with the start node of each pipe
+    :param end: int array with the end node of each pipe
+    :param nNodes: number of nodes
+    :param root: index of the node the first tree grows from (e.g., the reference node)
+    :return: a tuple (order, parent, parentPipe, parentSign, depth, inTree): order lists the nodes in breadth first
+             order, parent[n] is the parent node of n (-1 for the root of each tree), parentPipe[n] the pipe joining
+             them, parentSign[n] is +1 if that pipe points from the parent to n and -1 otherwise, depth[n] is the
+             distance from the root, and inTree flags the tree pipes
+    '''
+    adjacent = [[] for n in range(nNodes)]
+    for k, (a, b) in enumerate(zip(start, end)):
+        adjacent[a].append((k, b, 1))
+        adjacent[b].append((k, a, -1))
+    parent = -np.ones(nNodes, dtype=int)
+    parentPipe = -np.ones(nNodes, dtype=int)
+    parentSign = np.zeros(nNodes)
+    depth = -np.ones(nNodes, dtype=int)
+    inTree = np.zeros(len(start), dtype=bool)
+    order = []
+    for r in [root % nNodes] + list(range(nNodes)):
+        if depth[r] >= 0:
+            continue
+        depth[r] = 0
+        order.append(r)
+        queue = deque([r])
+        while queue:
+            n = queue.popleft()
+            for k, m, sgn in adjacent[n]:
+                if depth[m] < 0:
+                    depth[m] = depth[n] + 1
+                    parent[m], parentPipe[m], parentSign[m] = n, k, sgn
+                    inTree[k] = True
+                    order.append(m)
+                    queue.append(m)
+    return np.array(order, dtype=int), parent, parentPipe, parentSign, depth, inTree
+
+
+def findFundamentalLoops(start, end, nNodes, tree=None):
+    '''
+    Finds a minimal set of independent loops of a pipe network.  Every pipe that is not in the spanning tree closes
+    exactly one fundamental loop through the tree, so there are (pipes - nodes + trees) loops in total.  Each loop
+    begins with its closing pipe, traversed from its start node to its end node, and then returns through the tree.
+    :param start: int array with the start node of each pipe
+    :param end: int array with the end node of each pipe
+    :param nNodes: number of nodes
+    :param tree: the result of spanningTree, if it is already known
+    :return: a list of loops, each a tuple (pipes, signs) where pipes is an int array of pipe indices in traversal
+             order and signs is +1 where the pipe is traversed from its start node to its end node and -1 otherwise
+    '''
+    if tree is None:
+        tree = spanningTree(start, end, nNodes)
+    order, parent, parentPipe, parentSign, depth, inTree = tree
+    loops = []
+    for k in np.flatnonzero(~inTree):
+        u, v = start[k], end[k]
+        # climb from both ends of the closing pipe to their lowest common ancestor
+        up = []  # tree pipes from v up to the ancestor, traversed child to parent
+        down = []  # tree pipes from u up to the ancestor, traversed later from parent to child
+        a, b = v, u
+        while a != b:
+            if depth[a] >= depth[b]:
+                up.append((parentPipe[a], -parentSign[a]))
+                a = parent[a]
+            else:
+                down.append((parentPipe[b], parentSign[b]))
+                b = parent[b]
+        path = [(k, 1.0)] + up + down[::-1]
+        loops.append((np.array([e for e, s in path], dtype=int), np.array([s for e, s in path], dtype=float)))
+    return loops
+
+
+def loopMatrix(loops, nPipes):
+    '''
+    :param loops: a list of (pipes, signs) tuples as returned by findFundamentalLoops
+    :param nPipes: number of pipes
+    :return: the signed loop-pipe matrix as a scipy.sparse csr_matrix of shape (number of loops, number of pipes)
+    '''
+    rows = np.concatenate([np.full(len(p), l) for l, (p, s) in enumerate(loops)] + [np.zeros(0, dtype=int)])
+    cols = np.concatenate([p for p, s in loops] + [np.zeros(0, dtype=int)])
+    vals = np.concatenate([s for p, s in loops] + [np.zeros(0)])
+    return coo_matrix((vals, (rows, cols)), shape=(len(loops), nPipes)).tocsr()
+
+
+def treeFlows(extFlow, tree, nPipes):
+    '''
+    A particular solution of node continuity: flows in the spanning tree pipes only, found by working from the
+    leaves of each tree back to its root.  Every node's subtree must be fed its net external outflow through the
+    pipe to its parent, and the root of each tree takes up any imbalance of the external flows.
+    :param extFlow: array of external flows into the nodes in L/s
+    :param tree: the result of spanningTree
+    :param nPipes: number of pipes
+    :return: an array of pipe flow rates in L/s (zero in the pipes that close loops)
+    '''
+    order, parent, parentPipe, parentSign, depth, inTree = tree
+    subtree = np.array(extFlow, dtype=float)  # net external inflow of the subtree of each node
+    Q = np.zeros(nPipes)
+    for n in order[::-1]:
+        if parent[n] < 0:
+            continue
+        # the flow from the parent into n must carry the subtree's net outflow, -subtree[n]
+        Q[parentPipe[n]] = -parentSign[n] * subtree[n]
+        subtree[parent[n]] += subtree[n]
+    return Q
+# endregion
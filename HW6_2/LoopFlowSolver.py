@@ -0,0 +1,46 @@
+# region imports
+import numpy as np
+from scipy.sparse import diags
+from scipy.sparse.linalg import splu
+from GGASolver import headLoss
+# endregion
+
+# region function definitions
+def solveLoopFlows(C, Qp, K, alpha, relrough, q0=None, tol=1e-8, maxIter=50, model='smooth', z=None):
+    '''
+    Loop flow formulation of a pipe network.  The pipe flows are written as Q = Qp + C^T q, where Qp satisfies
+    node continuity exactly (e.g., the spanning tree flows of LoopFinder.treeFlows) and q holds one circulating
+    flow per independent loop, so continuity holds for any q.  Only the loop energy equations C hl(Q) = 0 remain,
+    with one unknown per loop instead of one per pipe.  Newton's method uses the analytic Jacobian C D C^T with
+    D = diag(d hl/dQ), which is sparse, symmetric and positive definite.
+    :param C: scipy.sparse signed loop-pipe matrix (loops x pipes), see LoopFinder.loopMatrix
+    :param Qp: array of pipe flows in L/s that satisfy continuity
+    :param K: array of head loss coefficients of the pipes (see GGASolver.headLoss)
+    :param alpha: array of Reynolds number per unit flow rate of the pipes (see GGASolver.headLoss)
+    :param relrough: array of relative roughness of the pipes
+    :param q0: optional initial loop flows in L/s (zero by default)
+    :param tol: convergence tolerance on the loop flow corrections in L/s and the loop head losses in m
+    :param maxIter: maximum number of iterations
+    :param model: transitional friction model (see Friction.frictionFactor)
+    :param z: array of standard normal deviates for the 'stochastic' and 'tapered' models, held fixed during the
+              solve
+    :return: a tuple (Q, q, info) with the pipe flows in L/s, the loop flows in L/s, and a dictionary with
+             'converged' and 'iterations'
+    '''
+    C = C.tocsr()
+    CT = C.T.tocsr()
+    q = np.zeros(C.shape[0]) if q0 is None else np.asarray(q0, dtype=float).copy()
+    Q = Qp + CT @ q
+    converged = C.shape[0] == 0
+    iteration = 0
+    while not converged and iteration < maxIter:
+        iteration += 1
+        hl, D = headLoss(Q, K, alpha, relrough, model, z)
+        r = C @ hl
+        J = (C @ diags(D) @ CT).tocsc()
+        dq = splu(J, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0, options=dict(SymmetricMode=True)).solve(-r)
+        q += dq
+        Q = Qp + CT @ q
+        converged = np.abs(dq).max() < tol and np.abs(r).max() < tol
+    return Q, q, {'converged': converged, 'iterations': iteration}
+# endregion
@@ -1,137 +1,126 @@
-# region imports
-import math
-import numpy as np
-import random as rnd
-from scipy.optimize import fsolve
-from Fluid import Fluid
-# endregion
-
-# region class definitions
-class Pipe():
-    # region constructor
-    def __init__(self, Start='A', End='B', L=100, D=200, r=0.00025, fluid=None):
-        '''
-        Defines a generic pipe with orientation from lowest letter to highest, alphabetically.
-        :param Start: the start node (string)
-        :param End: the end node (string)
-        :param L: the pipe length in m (float)
-        :param D: the pipe diameter in mm (float)
-        :param r: the pipe roughness in m  (float)
-        :param fluid:  a Fluid object (typically water)
-        '''
-        # region attributes
-        # from arguments given in constructor
-        self.startNode = min(Start, End)  # makes sure to use the lowest letter for startNode
-        self.endNode = max(Start, End)  # makes sure to use the highest letter for the endNode
-        self.length = L
-        self.r = r
-        self.fluid = fluid if fluid is not None else Fluid()  # Avoid mutable default argument
-
-        # other calculated properties
-        self.d = D / 1000.0  # diameter in m
-        self.relrough = self.r / self.d  # calculate relative roughness for easy use later
-        self.A = math.pi / 4.0 * self.d**2  # calculate pipe cross sectional area for easy use later
-        self.Q = 10  # working in units of L/s, just an initial guess
-        self.vel = self.V()  # calculate the initial velocity of the fluid
-        self.reynolds = self.Re()  # calculate the initial reynolds number
-        # endregion
-    # endregion
-
-    # region methods
-    def V(self):
-        '''
-        Calculate average velocity in the pipe for volumetric flow self.Q
-        :return: the average velocity in m/s
-        '''
-        self.vel = (self.Q / 1000) / self.A  # Convert Q from L/s to m^3/s and calculate V = Q/A
-        return self.vel
-
-    def Re(self):
-        '''
-        Calculate the reynolds number under current conditions.
-        :return:
-        '''
-        self.reynolds = (self.fluid.rho * self.vel * self.d) / self.fluid.mu  # Re = rho * V * d / mu
-        return self.reynolds
-
-    def FrictionFactor(self):
-        """
-        This function calculates the friction factor for a pipe based on the
-        notion of laminar, turbulent and transitional flow.
-        :return: the (Darcy) friction factor
-        """
-        # update the Reynolds number and make a local variable Re
-        Re = self.Re()
-        rr = self.relrough
-        # to be used for turbulent flow
-        def CB():
-            # note: in numpy log is for natural log. log10 is log base 10.
-            cb = lambda f: 1 / (f**0.5) + 2.0 * np.log10(rr / 3.7 + 2.51 / (Re * f**0.5))
-            result = fsolve(cb, (0.01))
-            val = cb(result[0])
-            return result[0]
-        # to be used for laminar flow
-        def lam():
-            return 64 / Re
-
-        if Re >= 4000:  # true for turbulent flow
-            return CB()
-        if Re <= 2000:  # true for laminar flow
-            return lam()
-
-        # transition flow is ambiguous, so use normal variate weighted by Re
-        CBff = CB()
-        Lamff = lam()
-        # I assume laminar is more accurate when just above 2000 and CB more accurate when just below Re 4000.
-        # I will weight the mean appropriately using a linear interpolation.
-        mean = Lamff + ((Re - 2000) / (4000 - 2000)) * (CBff - Lamff)
-        sig = 0.2 * mean
-        # Now, use normalvariate to put some randomness in the choice
-        return rnd.normalvariate(mean, sig)
-
-    def frictionHeadLoss(self):  # calculate headloss through a section of pipe in m of fluid
-        '''
-        Use the Darcy-Weisbach equation to find the head loss through a section of pipe.
-        '''
-        g = 9.81  # m/s^2
-        ff = self.FrictionFactor()
-        hl = ff * (self.length / self.d) * (self.vel**2 / (2 * g))  # Darcy-Weisbach equation
-        return hl
-
-    def getFlowHeadLoss(self, s):
-        '''
-        Calculate the head loss for the pipe.
-        :param s: the node I'm starting with in a traversal of the pipe
-        :return: the signed headloss through the pipe in m of fluid
-        '''
-        # while traversing a loop, if s = startNode I'm traversing in same direction as positive pipe
-        nTraverse = 1 if s == self.startNode else -1
-        # if flow is positive sense, scalar =1 else =-1
-        nFlow = 1 if self.Q >= 0 else -1
-        return nTraverse * nFlow * self.frictionHeadLoss()
-
-    def Name(self):
-        '''
-        Gets the pipe name.
-        :return:
-        '''
-        return self.startNode + '-' + self.endNode
-
-    def oContainsNode(self, node):
-        # does the pipe connect to the node?
-        return self.startNode == node or self.endNode == node
-
-    def printPipeFlowRate(self):
-        print('The flow in segment {} is {:0.2f} L/s'.format(self.Name(), self.Q))
-
-    def getFlowIntoNode(self, n):
-        '''
-        Determines the flow rate into node n
-        :param n: a node object
-        :return: +/-Q
-        '''
-        if n == self.startNode:
-            return -self.Q
-        return self.Q
-    # endregion
+# region imports
+import math
+import random as rnd
+from Fluid import Fluid
+from Friction import frictionFactor, RANDOM_MODELS
+# endregion
+
+# region class definitions
+class Pipe():
+    # region constructor
+    def __init__(self, Start='A', End='B', L=100, D=200, r=0.00025, fluid=None, frictionModel='smooth', rng=None):
+        '''
+        Defines a generic pipe with orientation from lowest letter to highest, alphabetically.
+        :param Start: the start node (string)
+        :param End: the end node (string)
+        :param L: the pipe length in m (float)
+        :param D: the pipe diameter in mm (float)
+        :param r: the pipe roughness in m  (float)
+        :param fluid:  a Fluid object (typically water)
+        :param frictionModel: the model for transitional flow, 'smooth', 'linear', 'stochastic' or
+                              'tapered' (see Friction.frictionFactor)
+        :param rng: a random number generator with a normalvariate method for the random models, e.g.
+                    random.Random(seed) (None uses the random module)
+        '''
+        # region attributes
+        # from arguments given in constructor
+        self.startNode = min(Start, End)  # makes sure to use the lowest letter for startNode
+        self.endNode = max(Start, End)  # makes sure to use the highest letter for the endNode
+        self.length = L
+        self.r = r
+        self.fluid = fluid if fluid is not None else Fluid()  # Avoid mutable default argument
+        self.frictionModel = frictionModel
+        self.rng = rng  # the random module itself is not stored, so the pipe can be pickled
+
+        # other calculated properties
+        self.d = D / 1000.0  # diameter in m
+        self.relrough = self.r / self.d  # calculate relative roughness for easy use later
+        self.A = math.pi / 4.0 * self.d**2  # calculate pipe cross sectional area for easy use later
+        self.Q = 10  # working in units of L/s, just an initial guess
+        self.vel = self.V()  # calculate the initial velocity of the fluid
+        self.reynolds = self.Re()  # calculate the initial reynolds number
+        # endregion
+    # endregion
+
+    # region methods
+    def V(self):
+        '''
+        Calculate average velocity in the pipe for volumetric flow self.Q
+        :return: the average velocity in m/s
+        '''
+        self.vel = (self.Q / 1000) / self.A  # Convert Q from L/s to m^3/s and calculate V = Q/A
+        return self.vel
+
+    def Re(self):
+        '''
+        Calculate the reynolds number under current conditions.  It uses the speed of the flow, so a pipe carrying
+        flow against its positive direction gets the same friction factor as one carrying it forward.
+        :return:
+        '''
+        self.reynolds = (self.fluid.rho * abs(self.vel) * self.d) / self.fluid.mu  # Re = rho * |V| * d / mu
+        return self.reynolds
+
+    def FrictionFactor(self):
+        """
+        This function calculates the friction factor for a pipe based on the
+        notion of laminar, turbulent and transitional flow.  Transitional flow uses the model in self.frictionModel
+        (see Friction.frictionFactor); the 'stochastic' and 'tapered' models draw a new normal deviate from self.rng
+        every call, the 'stochastic' one exactly as the original normalvariate(mean, 0.2*mean) draw.
+        :return: the (Darcy) friction factor
+        """
+        # update the Reynolds number and make a local variable Re
+        Re = self.Re()
+        # transition flow is ambiguous, so the stochastic model puts some randomness in the choice
+        rng = self.rng if self.rng is not None else rnd
+        if self.frictionModel == 'stochastic' and 2000.0 < Re < 4000.0:
+            mean = float(frictionFactor(Re, self.relrough, 'linear')[0][()])
+            return rng.normalvariate(mean, 0.2 * mean)
+        z = rng.normalvariate(0.0, 1.0) if self.frictionModel in RANDOM_MODELS else None
+        return float(frictionFactor(Re, self.relrough, self.frictionModel, z)[0][()])
+
+    def frictionHeadLoss(self):  # calculate headloss through a section of pipe in m of fluid
+        '''
+        Use the Darcy-Weisbach equation to find the head loss through a section of pipe.
+        '''
+        g = 9.81  # m/s^2
+        ff = self.FrictionFactor()
+        hl = ff * (self.length / self.d) * (self.vel**2 / (2 * g))  # Darcy-Weisbach equation
+        return hl
+
+    def getFlowHeadLoss(self, s):
+        '''
+        Calculate the head loss for the pipe.
+        :param s: the node I'm starting with in a traversal of the pipe
+        :return: the signed headloss through the pipe in m of fluid
+        '''
+        # while traversing a loop, if s = startNode I'm traversing in same direction as positive pipe
+        nTraverse = 1 if s == self.startNode else -1
+        # if flow is positive sense, scalar =1 else =-1
+        nFlow = 1 if self.Q >= 0 else -1
+        return nTraverse * nFlow * self.frictionHeadLoss()
+
+    def Name(self):
+        '''
+        Gets the pipe name.
+        :return:
+        '''
+        return self.startNode + '-' + self.endNode
+
+    def oContainsNode(self, node):
+        # does the pipe connect to the node?
+        return self.startNode == node or self.endNode == node
+
+    def printPipeFlowRate(self):
+        print('The flow in segment {} is {:0.2f} L/s'.format(self.Name(), self.Q))
+
+    def getFlowIntoNode(self, n):
+        '''
+        Determines the flow rate into node n
+        :param n: a node object
+        :return: +/-Q
+        '''
+        if n == self.startNode:
+            return -self.Q
+        return self.Q
+    # endregion
 # endregion
\ No newline at end of file
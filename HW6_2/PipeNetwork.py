@@ -1,122 +1,491 @@
-#region imports
-from scipy.optimize import fsolve
-import numpy as np
-from Fluid import Fluid
-from Node import Node
-#endregion
-
-# region class definitions
-class PipeNetwork():
-    #region constructor
-    def __init__(self, Pipes=[], Loops=[], Nodes=[], fluid=Fluid()):
-        '''
-        The pipe network is built from pipe, node, loop, and fluid objects.
-        :param Pipes: a list of pipe objects
-        :param Loops: a list of loop objects
-        :param Nodes: a list of node objects
-        :param fluid: a fluid object
-        '''
-        #region attributes
-        self.loops = Loops
-        self.nodes = Nodes
-        self.Fluid = fluid
-        self.pipes = Pipes
-        #endregion
-    #endregion
-
-    #region methods
-    def findFlowRates(self):
-        '''
-        A method to analyze the pipe network and find the flow rates in each pipe
-        given the constraints of: i) no net flow into a node and ii) no net pressure drops in the loops.
-        :return: a list of flow rates in the pipes
-        '''
-        # Build an initial guess for flow rates in the pipes.
-        Q0 = np.zeros(len(self.pipes))
-        Q0[0] = 30  # Initial guess for pipe a-b
-        Q0[1] = 30  # Initial guess for pipe a-c
-
-        def fn(q):
-            """
-            This is used as a callback for fsolve. The mass continuity equations at the nodes and the loop equations
-            are functions of the flow rates in the pipes. Hence, fsolve will search for the roots of these equations
-            by varying the flow rates in each pipe.
-            :param q: an array of flowrates in the pipes
-            :return: L an array containing flow rates at the nodes (excluding the last one) and pressure losses for the loops
-            """
-            # Update the flow rate in each pipe object
-            for i in range(len(self.pipes)):
-                self.pipes[i].Q = q[i]
-
-            # Calculate the net flow rate for the node objects (excluding the last node)
-            qNet = [n.getNetFlowRate() for n in self.nodes[:-1]]  # Exclude the last node
-
-            # Calculate the net head loss for the loop objects
-            lhl = self.getLoopHeadLosses()
-
-            return qNet + lhl  # Combine node flows (excluding the last node) and loop head losses
-
-        # Using fsolve to find the flow rates
-        FR = fsolve(fn, Q0)
-        return FR
-
-    def getNodeFlowRates(self):
-        # each node object is responsible for calculating its own net flow rate
-        qNet = [n.getNetFlowRate() for n in self.nodes]
-        return qNet
-
-    def getLoopHeadLosses(self):
-        # each loop object is responsible for calculating its own net head loss
-        lhl = [l.getLoopHeadLoss() for l in self.loops]
-        return lhl
-
-    def getPipe(self, name):
-        # returns a pipe object by its name
-        for p in self.pipes:
-            if name == p.Name():
-                return p
-
-    def getNodePipes(self, node):
-        # returns a list of pipe objects that are connected to the node object
-        l = []
-        for p in self.pipes:
-            if p.oContainsNode(node):
-                l.append(p)
-        return l
-
-    def nodeBuilt(self, node):
-        # determines if I have already constructed this node object (by name)
-        for n in self.nodes:
-            if n.name == node:
-                return True
-        return False
-
-    def getNode(self, name):
-        # returns one of the node objects by name
-        for n in self.nodes:
-            if n.name == name:
-                return n
-
-    def buildNodes(self):
-        # automatically create the node objects by looking at the pipe ends
-        for p in self.pipes:
-            if self.nodeBuilt(p.startNode) == False:
-                # instantiate a node object and append it to the list of nodes
-                self.nodes.append(Node(p.startNode, self.getNodePipes(p.startNode)))
-            if self.nodeBuilt(p.endNode) == False:
-                # instantiate a node object and append it to the list of nodes
-                self.nodes.append(Node(p.endNode, self.getNodePipes(p.endNode)))
-
-    def printPipeFlowRates(self):
-        for p in self.pipes:
-            p.printPipeFlowRate()
-
-    def printNetNodeFlows(self):
-        for n in self.nodes:
-            print('net flow into node {} is {:0.2f}'.format(n.name, n.getNetFlowRate()))
-
-    def printLoopHeadLoss(self):
-        for l in self.loops:
-            print('head loss for loop {} is {:0.2f}'.format(l.name, l.getLoopHeadLoss()))
-    #endregion
+#region imports
+import random as rnd
+import threading
+from scipy.optimize import fsolve
+from scipy.sparse import coo_matrix
+import numpy as np
+from Fluid import Fluid
+from Node import Node
+from Loop import Loop
+from LoopFinder import spanningTree, findFundamentalLoops, loopMatrix, treeFlows
+from LoopFlowSolver import solveLoopFlows
+from Contingency import analyzeOutages
+from GGASolver import solveGGA, headLoss
+from Sensitivity import headLossParameterDerivatives, adjointSensitivities
+from CompiledNetwork import CompiledNetwork
+from Friction import MODELS, RANDOM_MODELS
+#endregion
+
+# region class definitions
+class PipeNetwork():
+    #region constructor
+    def __init__(self, Pipes=None, Loops=None, Nodes=None, fluid=None):
+        '''
+        The pipe network is built from pipe, node, loop, and fluid objects.
+        :param Pipes: a list of pipe objects
+        :param Loops: a list of loop objects
+        :param Nodes: a list of node objects
+        :param fluid: a fluid object
+        '''
+        #region attributes
+        self.loops = Loops if Loops is not None else []  # Avoid mutable default argument
+        self.nodes = Nodes if Nodes is not None else []
+        self.Fluid = fluid if fluid is not None else Fluid()
+        self.pipes = Pipes if Pipes is not None else []
+        self.frictionModel = 'smooth'  # transitional friction model, see setFrictionModel
+        self.rng = rnd.Random()  # random numbers for the random friction models
+        self.pipeNumber = {}  # pipe name -> position in self.pipes, see updateIndex
+        self.nodeNumber = {}  # node name -> position in self.nodes and row in the incidence matrix
+        self.incidence = None  # signed node-pipe incidence matrix
+        self.indexSignature = None  # identity of the pipes and nodes when the index was built, see updateIndex
+        self.lock = threading.Lock()  # guards the index and the random number generator between threads
+        #endregion
+    #endregion
+
+    #region methods
+    def __getstate__(self):
+        '''
+        The lock can not be pickled or copied, so it is left out when the network is pickled (e.g., to send it to a
+        process pool) or deep copied; __setstate__ gives the copy a lock of its own.
+        :return: the attributes of the network without the lock
+        '''
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def findFlowRates(self):
+        '''
+        A method to analyze the pipe network and find the flow rates in each pipe
+        given the constraints of: i) no net flow into a node and ii) no net pressure drops in the loops.
+        The residuals are evaluated on a compiled copy of the network (see CompiledNetwork), and the flows are
+        written back to the pipes once fsolve is done.
+        :return: a list of flow rates in the pipes
+        '''
+        net = self.compile()
+        z = self.drawDeviates()
+        # Build an initial guess for flow rates in the pipes.
+        Q0 = np.zeros(len(self.pipes))
+        Q0[0] = 30  # Initial guess for pipe a-b
+        Q0[1] = 30  # Initial guess for pipe a-c
+
+        def fn(q):
+            """
+            This is used as a callback for fsolve. The mass continuity equations at the nodes and the loop equations
+            are functions of the flow rates in the pipes. Hence, fsolve will search for the roots of these equations
+            by varying the flow rates in each pipe.
+            :param q: an array of flowrates in the pipes
+            :return: L an array containing flow rates at the nodes (excluding the last one) and pressure losses for the loops
+            """
+            # Calculate the net flow rate into the nodes (excluding the last node)
+            qNet = net.nodeFlowRates(q)[:-1]
+
+            # Calculate the net head loss for the loops
+            lhl = net.loopHeadLosses(q, self.frictionModel, z)
+
+            return np.concatenate([qNet, lhl])  # Combine node flows (excluding the last node) and loop head losses
+
+        # Using fsolve to find the flow rates
+        FR = fsolve(fn, Q0)
+        net.writeBack(FR)
+        return FR
+
+    def compile(self):
+        '''
+        Freezes the network into contiguous arrays for fast residual evaluation (see CompiledNetwork).  The
+        compiled copy does not follow later changes to the pipes, nodes or loops, so compile again after editing.
+        :return: a CompiledNetwork
+        '''
+        self.updateIndex()
+        return CompiledNetwork(self.pipes, self.nodes, self.loops)
+
+    def drawDeviates(self):
+        '''
+        In the Monte Carlo mode each pipe's transitional friction factor is drawn once per solve, so that the
+        solve itself stays deterministic.
+        :return: a list of standard normal deviates, one per pipe, for the 'stochastic' and 'tapered' models,
+                 otherwise None
+        '''
+        if self.frictionModel not in RANDOM_MODELS:
+            return None
+        with self.lock:
+            return [self.rng.gauss(0.0, 1.0) for p in self.pipes]
+
+    def setFrictionModel(self, model='smooth', seed=None, rng=None):
+        '''
+        Selects the friction model for transitional flow (2000 < Re < 4000) in every pipe (see
+        Friction.frictionFactor).  'smooth' and 'linear' are deterministic; 'stochastic' (the original Monte Carlo
+        mode) and 'tapered' draw from a random number generator seeded with seed, so a run can be reproduced.
+        :param model: 'smooth', 'linear', 'stochastic' or 'tapered'
+        :param seed: seed of the random number generator (None to seed from the system)
+        :param rng: a random.Random to use as it is, instead of a new one seeded with seed
+        :return: nothing
+        '''
+        if model not in MODELS:
+            raise ValueError("Unknown friction model '{}'".format(model))
+        self.frictionModel = model
+        self.rng = rng if rng is not None else rnd.Random(seed)
+        for p in self.pipes:
+            p.frictionModel = model
+            p.rng = self.rng
+
+    def findFlowRatesGGA(self, refNode=None, tol=1e-8, maxIter=50):
+        '''
+        Finds the flow rates in each pipe with the Global Gradient Algorithm (see GGASolver.solveGGA), which needs
+        no loop definitions: the node-pipe incidence matrix and analytic Darcy-Weisbach derivatives give one
+        sparse symmetric solve per iteration.  The flows are stored on the pipes and the heads on the nodes.
+        :param refNode: name of the node whose head is fixed at 0 m (defaults to the last node)
+        :param tol: convergence tolerance in L/s
+        :param maxIter: maximum number of iterations
+        :return: an array of flow rates in the pipes in L/s
+        '''
+        net = self.compile()
+        Q, H, info = self.solve(refNode, tol=tol, maxIter=maxIter, net=net)
+        if not info['converged']:
+            print('Warning: GGA did not converge in {} iterations'.format(info['iterations']))
+        net.writeBack(Q, H)
+        return Q
+
+    def solve(self, refNode=None, extFlow=None, Q0=None, tol=1e-8, maxIter=50, net=None):
+        '''
+        Re-entrant Global Gradient Algorithm solve (see findFlowRatesGGA).  All iteration state lives in local
+        arrays and the network is only read, never modified, so several threads may solve the same or different
+        networks at once, e.g. to serve independent requests from a thread pool.
+        :param refNode: name of the node whose head is fixed at 0 m (defaults to the last node)
+        :param extFlow: optional array of external node flows in L/s to use instead of those of the nodes
+        :param Q0: optional initial pipe flows in L/s (defaults to the flows stored on the pipes)
+        :param tol: convergence tolerance in L/s
+        :param maxIter: maximum number of iterations
+        :param net: a CompiledNetwork of this network, if it is already compiled
+        :return: a tuple (Q, H, info) with the pipe flows in L/s, the node heads in m, and the info dictionary of
+                 GGASolver.solveGGA
+        '''
+        net = net if net is not None else self.compile()
+        z = self.drawDeviates()
+        ref = -1 if refNode is None else self.getNodeNumber(refNode)
+        Q0 = Q0 if Q0 is not None else np.array([p.Q for p in net.pipes], dtype=float)
+        ext = extFlow if extFlow is not None else net.extFlow
+        return solveGGA(net.incidence, net.K, net.alpha, net.relrough, ext, ref, Q0, tol, maxIter,
+                        self.frictionModel, z)
+
+    def getSensitivities(self, flows=(), heads=(), gradQ=None, gradH=None, refNode=None, tol=1e-8, maxIter=50):
+        '''
+        Derivatives of chosen outputs with respect to the diameter d (m), length L (m) and roughness r (m) of every
+        pipe, from one converged solution and one adjoint solve (see Sensitivity.adjointSensitivities), rather than
+        one solve per parameter with finite differences.  Outputs are pipe flows, node heads (relative to the
+        reference node) and, optionally, an objective J(Q, H) given by its gradients, e.g. gradQ = 2 (Q - Qmeasured)
+        for calibrating roughness against measured flows.  Loop head losses vanish at every converged solution, so
+        their sensitivities are zero.  The network is solved but not modified.
+        :param flows: names of the pipes whose flow rates are outputs
+        :param heads: names of the nodes whose heads are outputs
+        :param gradQ: optional array of dJ/dQ, one per pipe in the order of self.pipes
+        :param gradH: optional array of dJ/dH, one per node in the order of self.nodes
+        :param refNode: name of the node whose head is fixed at 0 m (defaults to the last node)
+        :param tol: convergence tolerance in L/s
+        :param maxIter: maximum number of iterations
+        :return: a dictionary with keys 'd', 'L' and 'r', each an array with one row per output (flows, then heads,
+                 then the objective) and one column per pipe; flows are in L/s and heads in m
+        '''
+        net = self.compile()
+        z = self.drawDeviates()
+        ref = -1 if refNode is None else self.getNodeNumber(refNode)
+        Q, H, info = solveGGA(net.incidence, net.K, net.alpha, net.relrough, net.extFlow, ref,
+                              np.array([p.Q for p in self.pipes], dtype=float), tol, maxIter, self.frictionModel, z)
+        if not info['converged']:
+            print('Warning: GGA did not converge in {} iterations'.format(info['iterations']))
+        P, N = len(self.pipes), len(self.nodes)
+        pipeNumber = {p.Name(): i for i, p in enumerate(self.pipes)}
+        cQ = np.zeros((P, len(flows) + len(heads)))
+        cH = np.zeros((N, len(flows) + len(heads)))
+        for j, name in enumerate(flows):
+            cQ[pipeNumber[name], j] = 1.0
+        for j, name in enumerate(heads):
+            cH[self.getNodeNumber(name), len(flows) + j] = 1.0
+        if gradQ is not None or gradH is not None:
+            cQ = np.column_stack([cQ, gradQ if gradQ is not None else np.zeros(P)])
+            cH = np.column_stack([cH, gradH if gradH is not None else np.zeros(N)])
+        D = headLoss(Q, net.K, net.alpha, net.relrough, self.frictionModel, z)[1]
+        dd, dL, dr = headLossParameterDerivatives(Q, net.K, net.alpha, net.relrough, net.d, net.length,
+                                                  self.frictionModel, z)
+        return adjointSensitivities(net.incidence, D, ref, {'d': dd, 'L': dL, 'r': dr}, cQ, cH)
+
+    def simulateExtendedPeriod(self, demands, refNode=None, tol=1e-8, maxIter=50, chunkSize=None):
+        '''
+        Extended period simulation: solves the network for a time series of external node flows with the Global
+        Gradient Algorithm (see findFlowRatesGGA).  The network is compiled once, and every step is warm started
+        from the solution of the previous one, which typically cuts the iterations to a few per step.  Results are
+        streamed out as they are computed, so neither the demands nor the results of a long run (e.g., 8760 hourly
+        steps) need to be held in memory at once.  The pipes and nodes are not modified.
+        :param demands: an iterable of rows (e.g., a 2D array or a generator), one per time step, each holding the
+                        external flow into every node in L/s in the order of self.nodes
+        :param refNode: name of the node whose head is fixed at 0 m (defaults to the last node)
+        :param tol: convergence tolerance in L/s
+        :param maxIter: maximum number of iterations per step
+        :param chunkSize: None to yield every step as it is solved, or the number of steps to collect per yield
+        :return: a generator; with chunkSize None it yields (Q, H, info) for every step with the pipe flows in L/s,
+                 the node heads in m and the info dictionary of GGASolver.solveGGA, otherwise it yields
+                 (Q, H, converged) with one row per step of the chunk (the last chunk may be shorter)
+        '''
+        net = self.compile()
+        ref = -1 if refNode is None else self.getNodeNumber(refNode)
+        Q = np.array([p.Q for p in self.pipes], dtype=float)
+        chunk = []
+        for ext in demands:
+            z = self.drawDeviates()
+            Q, H, info = solveGGA(net.incidence, net.K, net.alpha, net.relrough, ext, ref, Q, tol, maxIter,
+                                  self.frictionModel, z)
+            if chunkSize is None:
+                yield Q, H, info
+                continue
+            chunk.append((Q, H, info['converged']))
+            if len(chunk) == chunkSize:
+                yield np.array([c[0] for c in chunk]), np.array([c[1] for c in chunk]), np.array([c[2] for c in chunk])
+                chunk = []
+        if chunk:
+            yield np.array([c[0] for c in chunk]), np.array([c[1] for c in chunk]), np.array([c[2] for c in chunk])
+
+    def analyzeContingencies(self, outages=None, refNode=None, maxWorkers=None, tol=1e-8, maxIter=50):
+        '''
+        N-1 contingency analysis: solves the network with each pipe in turn taken out of service, in parallel on a
+        process pool (see Contingency.analyzeOutages).  The base case is solved first and warm starts every
+        outage.  Outages that cut off nodes with an external flow are reported as infeasible.  A random
+        friction model is replaced by the deterministic 'smooth' one.  The pipes and nodes are not modified.
+        On platforms that spawn worker processes (e.g., Windows) call this under if __name__ == "__main__".
+        :param outages: a list of pipe names to take out of service one at a time (defaults to every pipe)
+        :param refNode: name of the node whose head is fixed at 0 m (defaults to the last node)
+        :param maxWorkers: number of worker processes (defaults to the number of cores); 0 or 1 solves serially
+        :param tol: convergence tolerance in L/s
+        :param maxIter: maximum number of iterations per outage
+        :return: a numpy structured array with one row per outage (see Contingency.SUMMARY_DTYPE), where the
+                 pipe and node fields are indices into self.pipes and self.nodes
+        '''
+        net = self.compile()
+        model = 'smooth' if self.frictionModel in RANDOM_MODELS else self.frictionModel
+        ref = -1 if refNode is None else self.getNodeNumber(refNode)
+        Q0 = np.array([p.Q for p in self.pipes], dtype=float)
+        Q0 = solveGGA(net.incidence, net.K, net.alpha, net.relrough, net.extFlow, ref, Q0, tol, maxIter, model)[0]
+        network = {'start': net.start, 'end': net.end, 'K': net.K, 'alpha': net.alpha, 'relrough': net.relrough,
+                   'extFlow': net.extFlow, 'Q0': Q0, 'refNode': ref, 'tol': tol, 'maxIter': maxIter, 'model': model}
+        if outages is None:
+            outages = range(len(self.pipes))
+        else:
+            number = {p.Name(): i for i, p in enumerate(self.pipes)}
+            outages = [number[name] for name in outages]
+        return analyzeOutages(network, outages, maxWorkers)
+
+    def findFlowRatesLoop(self, refNode=None, tol=1e-8, maxIter=50):
+        '''
+        Finds the flow rates in each pipe with the loop flow formulation (see LoopFlowSolver.solveLoopFlows).  The
+        independent loops are found automatically from a spanning tree grown from the reference node, and the tree
+        flows that carry the external flows give a particular solution satisfying continuity exactly, so only one
+        loop flow per independent loop is solved for.  The Loop objects in self.loops are not used.  Tree loops
+        of large, densely meshed networks (e.g., street grids) are long and their Jacobian fills in, so
+        findFlowRatesGGA is the faster choice there.
+        :param refNode: name of the node that takes up any imbalance of the external flows (defaults to the last node)
+        :param tol: convergence tolerance in L/s
+        :param maxIter: maximum number of iterations
+        :return: an array of flow rates in the pipes in L/s
+        '''
+        net = self.compile()
+        z = self.drawDeviates()
+        ref = -1 if refNode is None else self.getNodeNumber(refNode)
+        tree = spanningTree(net.start, net.end, len(net.nodes), ref)
+        C = loopMatrix(findFundamentalLoops(net.start, net.end, len(net.nodes), tree), len(net.pipes))
+        Qp = treeFlows(net.extFlow, tree, len(net.pipes))
+        Q, q, info = solveLoopFlows(C, Qp, net.K, net.alpha, net.relrough, None, tol, maxIter, self.frictionModel, z)
+        if not info['converged']:
+            print('Warning: loop flow solve did not converge in {} iterations'.format(info['iterations']))
+        net.writeBack(Q)
+        return Q
+
+    def buildLoops(self):
+        '''
+        Automatically creates a set of independent Loop objects from the pipe graph (see
+        LoopFinder.findFundamentalLoops), replacing self.loops.  Each loop lists its pipes in traversal order
+        beginning with a pipe traversed in its positive direction, as Loop expects.  The loops are named 'A',
+        'B', ... (or 'L27', 'L28', ... beyond 26 loops).
+        :return: the list of loops
+        '''
+        self.updateIndex()
+        number = self.nodeNumber
+        start = np.array([number[p.startNode] for p in self.pipes], dtype=int)
+        end = np.array([number[p.endNode] for p in self.pipes], dtype=int)
+        loops = findFundamentalLoops(start, end, len(self.nodes))
+        self.loops = [Loop(chr(ord('A') + i) if i < 26 else 'L{}'.format(i + 1), [self.pipes[k] for k in pipes])
+                      for i, (pipes, signs) in enumerate(loops)]
+        return self.loops
+
+    def findFlowRatesMonteCarlo(self, nSamples=100, seed=None, refNode=None, model='stochastic'):
+        '''
+        Monte Carlo analysis of the uncertainty of transitional flow: solves the network nSamples times with a
+        random friction model, each sample drawing new transitional friction factors.  The friction model is
+        restored afterwards, together with the random number generator it used.  Every sample starts from the
+        deterministic solution, so up to round-off the result depends only on the seed, and the pipes are left with
+        the flows of the last sample.
+        :param nSamples: number of samples
+        :param seed: seed of the random number generator, for reproducible results
+        :param refNode: name of the reference node (see findFlowRatesGGA)
+        :param model: the random friction model, 'stochastic' or 'tapered' (see Friction.frictionFactor)
+        :return: an array of flow rates in L/s, one row per sample and one column per pipe
+        '''
+        if model not in RANDOM_MODELS:
+            raise ValueError("'{}' is not a random friction model".format(model))
+        oldModel, rng = self.frictionModel, self.rng
+        Q0 = self.findFlowRatesGGA(refNode)
+        self.setFrictionModel(model, seed)
+        try:
+            samples = []
+            for i in range(nSamples):
+                for p, q in zip(self.pipes, Q0):
+                    p.Q = q
+                samples.append(self.findFlowRatesGGA(refNode))
+            samples = np.array(samples)
+        finally:
+            self.setFrictionModel(oldModel, rng=rng)
+        return samples
+
+    def updateIndex(self):
+        '''
+        Builds the topology index: dictionaries from the names of the pipes and nodes to their positions in the
+        lists (a node's position is also its row in the incidence matrix), and the signed node-pipe incidence
+        matrix itself.  The pipes and nodes are plain lists that may be edited at any time, so the index is rebuilt
+        whenever a pipe or node was added, removed, replaced or renamed, as recorded by the identity and end names
+        of every pipe and node.  Checking that costs O(P), so it is done by the operations that are O(P) anyway;
+        lookups by name only come here when the index misses (see lookupPipe and lookupNode).
+        :return: nothing
+        '''
+        with self.lock:
+            signature = (tuple((id(p), p.startNode, p.endNode) for p in self.pipes),
+                         tuple((id(n), n.name) for n in self.nodes))
+            if signature == self.indexSignature:
+                return
+            self.pipeNumber = {p.Name(): k for k, p in enumerate(self.pipes)}
+            self.nodeNumber = {n.name: i for i, n in enumerate(self.nodes)}
+            self.incidence = self.buildIncidenceMatrix() if all(
+                p.startNode in self.nodeNumber and p.endNode in self.nodeNumber for p in self.pipes) else None
+            self.indexSignature = signature
+
+    def buildIncidenceMatrix(self):
+        '''
+        Builds the signed node-pipe incidence matrix: -1 at the start node and +1 at the end node of each pipe, so
+        that (A @ Q)[n] is the net pipe flow into node n.
+        :return: a scipy.sparse csr_matrix of shape (number of nodes, number of pipes)
+        '''
+        index = {n.name: i for i, n in enumerate(self.nodes)}
+        P = len(self.pipes)
+        rows = [index[p.startNode] for p in self.pipes] + [index[p.endNode] for p in self.pipes]
+        cols = list(range(P)) * 2
+        vals = [-1.0] * P + [1.0] * P
+        return coo_matrix((vals, (rows, cols)), shape=(len(self.nodes), P)).tocsr()
+
+    def getIncidenceMatrix(self):
+        '''
+        :return: the (cached) signed node-pipe incidence matrix, see buildIncidenceMatrix
+        '''
+        self.updateIndex()
+        if self.incidence is None:
+            raise ValueError('Some pipes end at nodes that have not been built, call buildNodes first.')
+        return self.incidence
+
+    def lookupPipe(self, name):
+        '''
+        Finds the position of a pipe in O(1).  A hit of the index is confirmed against the pipe at that position,
+        so the index is only brought up to date (see updateIndex) when the name is missing or the pipe there was
+        replaced or renamed.
+        :param name: the name of the pipe, e.g. 'a-b'
+        :return: the position of the pipe in self.pipes, or None if there is no such pipe
+        '''
+        k = self.pipeNumber.get(name)
+        if k is None or k >= len(self.pipes) or self.pipes[k].Name() != name:
+            self.updateIndex()
+            k = self.pipeNumber.get(name)
+        return k
+
+    def lookupNode(self, name):
+        '''
+        Finds the position of a node in O(1), like lookupPipe.
+        :param name: the name of the node
+        :return: the position of the node in self.nodes, or None if there is no such node
+        '''
+        k = self.nodeNumber.get(name)
+        if k is None or k >= len(self.nodes) or self.nodes[k].name != name:
+            self.updateIndex()
+            k = self.nodeNumber.get(name)
+        return k
+
+    def getNodeNumber(self, name):
+        # returns the row of a node in the incidence matrix
+        k = self.lookupNode(name)
+        if k is None:
+            raise KeyError(name)
+        return k
+
+    def getNodeFlowRates(self):
+        '''
+        The net flow rate into every node, A @ Q plus the external flows, in one vectorized operation.
+        :return: an array of net flow rates in L/s, in the order of self.nodes
+        '''
+        Q = np.array([p.Q for p in self.pipes], dtype=float)
+        ext = np.array([n.extFlow for n in self.nodes], dtype=float)
+        return self.getIncidenceMatrix() @ Q + ext
+
+    def getLoopHeadLosses(self):
+        # each loop object is responsible for calculating its own net head loss
+        lhl = [l.getLoopHeadLoss() for l in self.loops]
+        return lhl
+
+    def getPipe(self, name):
+        # returns a pipe object by its name
+        k = self.lookupPipe(name)
+        return self.pipes[k] if k is not None else None
+
+    def getNodePipes(self, node):
+        # returns a list of pipe objects that are connected to the node object
+        l = []
+        for p in self.pipes:
+            if p.oContainsNode(node):
+                l.append(p)
+        return l
+
+    def nodeBuilt(self, node):
+        # determines if I have already constructed this node object (by name)
+        return self.lookupNode(node) is not None
+
+    def getNode(self, name):
+        # returns one of the node objects by name
+        k = self.lookupNode(name)
+        return self.nodes[k] if k is not None else None
+
+    def buildNodes(self):
+        '''
+        Automatically creates the node objects by looking at the pipe ends.  The pipes at every node are gathered
+        in one pass over the pipes, so this is O(P) rather than a scan of the pipes for every pipe end.
+        :return: nothing
+        '''
+        nodePipes = {}
+        for p in self.pipes:
+            nodePipes.setdefault(p.startNode, []).append(p)
+            nodePipes.setdefault(p.endNode, []).append(p)
+        self.updateIndex()
+        for name, pipes in nodePipes.items():
+            if name not in self.nodeNumber:
+                # instantiate a node object and append it to the list of nodes
+                self.nodes.append(Node(name, pipes))
+        self.updateIndex()
+
+    def printPipeFlowRates(self):
+        for p in self.pipes:
+            p.printPipeFlowRate()
+
+    def printNetNodeFlows(self):
+        for n, q in zip(self.nodes, self.getNodeFlowRates()):
+            print('net flow into node {} is {:0.2f}'.format(n.name, q))
+
+    def printLoopHeadLoss(self):
+        for l in self.loops:
+            print('head loss for loop {} is {:0.2f}'.format(l.name, l.getLoopHeadLoss()))
+    #endregion
 # endregion
\ No newline at end of file
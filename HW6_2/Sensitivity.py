@@ -0,0 +1,65 @@
+# region imports
+import numpy as np
+from scipy.sparse import diags
+from scipy.sparse.linalg import splu
+from Friction import frictionFactor, frictionRoughnessDerivative
+# endregion
+
+# region function definitions
+def headLossParameterDerivatives(Q, K, alpha, relrough, d, L, model='smooth', z=None):
+    '''
+    Partial derivatives of the Darcy-Weisbach head loss hl = f(Re, rr) K Q|Q| of every pipe with respect to its own
+    diameter, length and roughness, at fixed flow.  With K proportional to L/d^5, Re = alpha |Q| proportional to 1/d
+    and rr = r/d:
+        d hl/dL = hl / L
+        d hl/dr = K Q|Q| f_rr / d
+        d hl/dd = -5 hl / d - K Q|Q| (f_Re Re + f_rr rr) / d
+    :param Q: array of pipe flow rates in L/s
+    :param K: array of head loss coefficients (see GGASolver.headLoss)
+    :param alpha: array of Reynolds number per unit flow rate (see GGASolver.headLoss)
+    :param relrough: array of relative roughness
+    :param d: array of pipe diameters in m
+    :param L: array of pipe lengths in m
+    :param model: transitional friction model (see Friction.frictionFactor)
+    :param z: array of standard normal deviates for the 'stochastic' and 'tapered' models
+    :return: a tuple (dhl/dd, dhl/dL, dhl/dr) of arrays, in m/m
+    '''
+    q = np.abs(Q)
+    Re = np.maximum(alpha * q, 1.0e-6)
+    f, fRe = frictionFactor(Re, relrough, model, z)
+    frr = frictionRoughnessDerivative(Re, relrough, model, z)
+    KQQ = K * Q * q
+    hl = f * KQQ
+    return -5.0 * hl / d - KQQ * (fRe * Re + frr * relrough) / d, hl / L, KQQ * frr / d
+
+
+def adjointSensitivities(A, D, refNode, dhl, cQ, cH):
+    '''
+    Sensitivities of linear outputs y = cQ^T Q + cH^T H of a converged pipe network solution with respect to pipe
+    parameters, by the adjoint method.  At the solution the equations F = [hl(Q) + A^T H; A Q + extFlow] = 0 (see
+    GGASolver.solveGGA) hold for every parameter value, so dy/dp = -lambda^T dF/dp where J^T lambda = c and J is
+    the Jacobian [[D, A^T], [A, 0]].  J is symmetric, so lambda comes from the same Schur complement A D^-1 A^T
+    the solver factors, one factorization for all outputs.  A pipe parameter only enters the energy equation of
+    its own pipe, so dy/dp_k = -lambdaQ_k * d hl_k/dp_k, for every pipe at once.
+    :param A: scipy.sparse incidence matrix (nodes x pipes)
+    :param D: array of head loss derivatives d hl/dQ at the solution (see GGASolver.headLoss)
+    :param refNode: index of the reference (fixed head) node
+    :param dhl: a dictionary of arrays of partial derivatives of each pipe's head loss, one per parameter (see
+                headLossParameterDerivatives)
+    :param cQ: array (pipes x outputs) of the weights of the pipe flows in each output
+    :param cH: array (nodes x outputs) of the weights of the node heads in each output
+    :return: a dictionary with, for every key of dhl, an array (outputs x pipes) of dy/dp
+    '''
+    nNodes = A.shape[0]
+    keep = np.ones(nNodes, dtype=bool)
+    keep[refNode] = False
+    Ar = A.tocsr()[keep]
+    ArT = Ar.T.tocsr()
+    cQ = np.asarray(cQ, dtype=float).reshape(A.shape[1], -1)
+    cH = np.asarray(cH, dtype=float).reshape(nNodes, -1)[keep]  # the reference head is fixed
+    S = (Ar @ diags(1.0 / D) @ ArT).tocsc()
+    lu = splu(S, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+    lamH = lu.solve(np.asarray(Ar @ (cQ / D[:, None]) - cH))
+    lamQ = (cQ - ArT @ lamH) / D[:, None]
+    return {key: -(lamQ * value[:, None]).T for key, value in dhl.items()}
+# endregion
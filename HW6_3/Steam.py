@@ -1,113 +1,188 @@
-# steam.py
-import numpy as np
-from scipy.interpolate import griddata
-
-class steam:
-    """
-    The steam class is used to find thermodynamic properties of steam along an isobar.
-    The Gibbs phase rule tells us we need two independent properties to determine
-    all other thermodynamic properties. Hence, the constructor requires pressure
-    and one other property.
-    """
-    def __init__(self, pressure, T=None, x=None, v=None, h=None, s=None, name=None):
-        '''
-        Constructor for steam.
-        :param pressure: pressure in kPa
-        :param T: Temperature in degrees C
-        :param x: quality of steam (x=1 is saturated vapor, x=0 is saturated liquid)
-        :param v: specific volume in m^3/kg
-        :param h: specific enthalpy in kJ/kg
-        :param s: specific entropy in kJ/(kg*K)
-        :param name: a convenient identifier
-        '''
-        self.p = pressure  # pressure in kPa
-        self.T = T  # temperature in degrees C
-        self.x = x  # quality
-        self.v = v  # specific volume in m^3/kg
-        self.h = h  # specific enthalpy in kJ/kg
-        self.s = s  # specific entropy in kJ/(kg*K)
-        self.name = name  # a useful identifier
-        self.region = None  # 'superheated', 'saturated', or 'two-phase'
-        if T is None and x is None and v is None and h is None and s is None:
-            return
-        else:
-            self.calc()
-
-    def calc(self):
-        '''
-        Calculate thermodynamic properties based on the given pressure and one other property.
-        '''
-        # Load thermodynamic data from files
-        ts, ps, hfs, hgs, sfs, sgs, vfs, vgs = np.loadtxt('sat_water_table.txt', unpack=True, skiprows=1)
-        tcol, hcol, scol, pcol = np.loadtxt('superheated_water_table.txt', unpack=True, skiprows=1)
-
-        R = 8.314 / (18 / 1000)  # ideal gas constant for water [J/(mol K)]/[kg/mol]
-        Pbar = self.p / 100  # pressure in bar (1 bar = 100 kPa)
-
-        # Get saturated properties
-        Tsat = float(griddata(ps, ts, Pbar))
-        hf = float(griddata(ps, hfs, Pbar))
-        hg = float(griddata(ps, hgs, Pbar))
-        sf = float(griddata(ps, sfs, Pbar))
-        sg = float(griddata(ps, sgs, Pbar))
-        vf = float(griddata(ps, vfs, Pbar))
-        vg = float(griddata(ps, vgs, Pbar))
-
-        self.hf = hf  # saturated liquid enthalpy
-
-        # Determine which second property is given
-        if self.T is not None:
-            if self.T > Tsat:  # superheated
-                self.region = 'Superheated'
-                self.h = float(griddata((tcol, pcol), hcol, (self.T, Pbar)))
-                self.s = float(griddata((tcol, pcol), scol, (self.T, Pbar)))
-                self.x = 1.0
-                TK = self.T + 273.14  # temperature in Kelvin
-                self.v = R * TK / (self.p * 1000)  # ideal gas approximation
-        elif self.x is not None:  # saturated
-            self.region = 'Saturated'
-            self.T = Tsat
-            self.h = hf + self.x * (hg - hf)
-            self.s = sf + self.x * (sg - sf)
-            self.v = vf + self.x * (vg - vf)
-        elif self.h is not None:
-            self.x = (self.h - hf) / (hg - hf)
-            if self.x <= 1.0:  # saturated
-                self.region = 'Saturated'
-                self.T = Tsat
-                self.s = sf + self.x * (sg - sf)
-                self.v = vf + self.x * (vg - vf)
-            else:  # superheated
-                self.region = 'Superheated'
-                self.T = float(griddata((hcol, pcol), tcol, (self.h, Pbar)))
-                self.s = float(griddata((hcol, pcol), scol, (self.h, Pbar)))
-        elif self.s is not None:
-            self.x = (self.s - sf) / (sg - sf)
-            if self.x <= 1.0:  # saturated
-                self.region = 'Saturated'
-                self.T = Tsat
-                self.h = hf + self.x * (hg - hf)
-                self.v = vf + self.x * (vg - vf)
-            else:  # superheated
-                self.region = 'Superheated'
-                self.T = float(griddata((scol, pcol), tcol, (self.s, Pbar)))
-                self.h = float(griddata((scol, pcol), hcol, (self.s, Pbar)))
-    def print(self):
-        """
-        Print a nicely formatted report of the steam properties.
-        """
-        print('Name: ', self.name)
-        if self.x < 0.0:
-            print('Region: compressed liquid')
-        else:
-            print('Region: ', self.region)
-        print('p = {:0.2f} kPa'.format(self.p))
-        if self.x >= 0.0:
-            print('T = {:0.1f} degrees C'.format(self.T))
-        print('h = {:0.2f} kJ/kg'.format(self.h))
-        if self.x >= 0.0:
-            print('s = {:0.4f} kJ/(kg K)'.format(self.s))
-            if self.region == 'Saturated':
-                print('v = {:0.6f} m^3/kg'.format(self.v))
-                print('x = {:0.4f}'.format(self.x))
+# steam.py
+import numpy as np
+from steam_tables import get_interpolators
+
+# region codes of steam_props
+REGION_UNDEFINED = 0  # outside the tables, T given at or below the saturation temperature, or x given above 1
+REGION_SATURATED = 1  # two-phase mixture, 0 <= x <= 1
+REGION_SUPERHEATED = 2
+REGION_COMPRESSED = 3  # x < 0, estimated by extrapolating the saturated mixture as steam.calc does
+REGION_NAMES = {REGION_UNDEFINED: 'undefined', REGION_SATURATED: 'Saturated', REGION_SUPERHEATED: 'Superheated',
+                REGION_COMPRESSED: 'compressed liquid'}
+STEAM_DTYPE = np.dtype([('p', float), ('T', float), ('h', float), ('s', float), ('v', float), ('x', float),
+                        ('region', np.int8)])
+R_WATER = 8.314 / (18 / 1000)  # ideal gas constant for water in J/(kg K)
+
+
+def steam_props(p, T=None, x=None, h=None, s=None):
+    '''
+    Array version of steam: the properties of any number of states in one vectorized pass.  Pressure and exactly
+    one other property are given as arrays (or scalars), broadcast against each other.  The regions are classified
+    with masks and every interpolation runs once over all the states of a region.  The states follow steam.calc,
+    except that superheated states always get x = 1 and the ideal gas specific volume.  A given quality is always
+    taken as a mixture, extrapolated like steam.calc when it lies outside [0, 1].
+    :param p: pressure(s) in kPa
+    :param T: temperature(s) in degrees C
+    :param x: quality (x=1 is saturated vapor, x=0 is saturated liquid)
+    :param h: specific enthalpy in kJ/kg
+    :param s: specific entropy in kJ/(kg*K)
+    :return: a structured array with dtype STEAM_DTYPE of the broadcast shape, with fields p, T, h, s, v, x and
+             region (see REGION_NAMES); properties that are undefined are nan
+    '''
+    given = [(name, value) for name, value in (('T', T), ('x', x), ('h', h), ('s', s)) if value is not None]
+    if len(given) != 1:
+        raise ValueError('steam_props needs the pressure and exactly one of T, x, h or s')
+    name, value = given[0]
+    p, value = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(value, dtype=float))
+    interp = get_interpolators()
+    Tsat, hf, hg, sf, sg, vf, vg = interp['sat'](p / 100)  # the saturated table is in bar
+
+    # quality from the given property, and the superheated states
+    if name == 'T':
+        q = np.where(value > Tsat, 1.0, np.nan)
+    elif name == 'x':
+        q = value
+    elif name == 'h':
+        q = (value - hf) / (hg - hf)
+    else:
+        q = (value - sf) / (sg - sf)
+    if name == 'T':
+        sup = value > Tsat
+    elif name == 'x':
+        sup = np.zeros(p.shape, dtype=bool)  # a given quality is always a mixture, as in steam.calc
+    else:
+        sup = q > 1.0
+    mix = ~sup & ~np.isnan(q)
+
+    out = np.empty(p.shape, dtype=STEAM_DTYPE)
+    for field in ('T', 'h', 's', 'v', 'x'):
+        out[field] = np.nan
+    out['p'] = p
+    out[name] = value
+    out['region'] = REGION_UNDEFINED
+
+    # two-phase mixture (or compressed liquid estimate)
+    out['x'][mix] = q[mix]
+    out['T'][mix] = Tsat[mix]
+    out['h'][mix] = (hf + q * (hg - hf))[mix]
+    out['s'][mix] = (sf + q * (sg - sf))[mix]
+    out['v'][mix] = (vf + q * (vg - vf))[mix]
+    out['region'][mix] = np.select([q[mix] < 0.0, q[mix] > 1.0], [REGION_COMPRESSED, REGION_UNDEFINED],
+                                   REGION_SATURATED)
+
+    # superheated steam, from the superheated table (in kPa)
+    if np.any(sup):
+        ps, ys = p[sup], value[sup]
+        if name == 'T':
+            out['h'][sup], out['s'][sup] = interp['Tp'](ys, ps).T
+        elif name == 'h':
+            out['T'][sup], out['s'][sup] = interp['hp'](ys, ps).T
+        else:
+            out['T'][sup], out['h'][sup] = interp['sp'](ys, ps).T
+        out['x'][sup] = 1.0
+        out['v'][sup] = R_WATER * (out['T'][sup] + 273.14) / (ps * 1000)  # ideal gas approximation
+        out['region'][sup] = np.where(np.isnan(out['T'][sup] + out['h'][sup] + out['s'][sup]),
+                                      REGION_UNDEFINED, REGION_SUPERHEATED)
+    return out
+
+
+class steam:
+    """
+    The steam class is used to find thermodynamic properties of steam along an isobar.
+    The Gibbs phase rule tells us we need two independent properties to determine
+    all other thermodynamic properties. Hence, the constructor requires pressure
+    and one other property.
+    """
+    def __init__(self, pressure, T=None, x=None, v=None, h=None, s=None, name=None):
+        '''
+        Constructor for steam.
+        :param pressure: pressure in kPa
+        :param T: Temperature in degrees C
+        :param x: quality of steam (x=1 is saturated vapor, x=0 is saturated liquid)
+        :param v: specific volume in m^3/kg
+        :param h: specific enthalpy in kJ/kg
+        :param s: specific entropy in kJ/(kg*K)
+        :param name: a convenient identifier
+        '''
+        self.p = pressure  # pressure in kPa
+        self.T = T  # temperature in degrees C
+        self.x = x  # quality
+        self.v = v  # specific volume in m^3/kg
+        self.h = h  # specific enthalpy in kJ/kg
+        self.s = s  # specific entropy in kJ/(kg*K)
+        self.name = name  # a useful identifier
+        self.region = None  # 'superheated', 'saturated', or 'two-phase'
+        if T is None and x is None and v is None and h is None and s is None:
+            return
+        else:
+            self.calc()
+
+    def calc(self):
+        '''
+        Calculate thermodynamic properties based on the given pressure and one other property.
+        '''
+        # Interpolators of the thermodynamic data, built once per process (see steam_tables)
+        interp = get_interpolators()
+
+        R = 8.314 / (18 / 1000)  # ideal gas constant for water [J/(mol K)]/[kg/mol]
+        Pbar = self.p / 100  # pressure in bar (1 bar = 100 kPa)
+
+        # Get saturated properties
+        Tsat, hf, hg, sf, sg, vf, vg = (float(v) for v in interp['sat'](Pbar))
+
+        self.hf = hf  # saturated liquid enthalpy
+
+        # Determine which second property is given
+        if self.T is not None:
+            if self.T > Tsat:  # superheated
+                self.region = 'Superheated'
+                # the superheated table is in kPa
+                self.h, self.s = (float(v) for v in interp['Tp'](self.T, self.p))
+                self.x = 1.0
+                TK = self.T + 273.14  # temperature in Kelvin
+                self.v = R * TK / (self.p * 1000)  # ideal gas approximation
+        elif self.x is not None:  # saturated
+            self.region = 'Saturated'
+            self.T = Tsat
+            self.h = hf + self.x * (hg - hf)
+            self.s = sf + self.x * (sg - sf)
+            self.v = vf + self.x * (vg - vf)
+        elif self.h is not None:
+            self.x = (self.h - hf) / (hg - hf)
+            if self.x <= 1.0:  # saturated
+                self.region = 'Saturated'
+                self.T = Tsat
+                self.s = sf + self.x * (sg - sf)
+                self.v = vf + self.x * (vg - vf)
+            else:  # superheated
+                self.region = 'Superheated'
+                self.T, self.s = (float(v) for v in interp['hp'](self.h, self.p))
+        elif self.s is not None:
+            self.x = (self.s - sf) / (sg - sf)
+            if self.x <= 1.0:  # saturated
+                self.region = 'Saturated'
+                self.T = Tsat
+                self.h = hf + self.x * (hg - hf)
+                self.v = vf + self.x * (vg - vf)
+            else:  # superheated
+                self.region = 'Superheated'
+                self.T, self.h = (float(v) for v in interp['sp'](self.s, self.p))
+    def print(self):
+        """
+        Print a nicely formatted report of the steam properties.
+        """
+        print('Name: ', self.name)
+        if self.x < 0.0:
+            print('Region: compressed liquid')
+        else:
+            print('Region: ', self.region)
+        print('p = {:0.2f} kPa'.format(self.p))
+        if self.x >= 0.0:
+            print('T = {:0.1f} degrees C'.format(self.T))
+        print('h = {:0.2f} kJ/kg'.format(self.h))
+        if self.x >= 0.0:
+            print('s = {:0.4f} kJ/(kg K)'.format(self.s))
+            if self.region == 'Saturated':
+                print('v = {:0.6f} m^3/kg'.format(self.v))
+                print('x = {:0.4f}'.format(self.x))
         print()
\ No newline at end of file
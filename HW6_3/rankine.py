@@ -1,69 +1,151 @@
-# rankine.py
-from Steam import steam
-
-class rankine:
-    def __init__(self, p_low=8, p_high=8000, t_high=None, name='Rankine Cycle'):
-        '''
-        Constructor for the Rankine cycle.
-        :param p_low: low pressure in kPa
-        :param p_high: high pressure in kPa
-        :param t_high: optional temperature for State 1 (turbine inlet) in degrees C
-        :param name: a convenient name
-        '''
-        self.p_low = p_low
-        self.p_high = p_high
-        self.t_high = t_high
-        self.name = name
-        self.efficiency = None
-        self.turbine_work = 0
-        self.pump_work = 0
-        self.heat_added = 0
-        self.state1 = None
-        self.state2 = None
-        self.state3 = None
-        self.state4 = None
-
-    def calc_efficiency(self):
-        '''
-        Calculate the efficiency of the Rankine cycle.
-        '''
-        # State 1: Turbine inlet (p_high, t_high) superheated or saturated vapor
-        if self.t_high is None:
-            self.state1 = steam(self.p_high, x=1, name='Turbine Inlet')  # saturated vapor
-        else:
-            self.state1 = steam(self.p_high, T=self.t_high, name='Turbine Inlet')  # superheated steam
-
-        # State 2: Turbine exit (p_low, s=s_turbine inlet) two-phase
-        self.state2 = steam(self.p_low, s=self.state1.s, name='Turbine Exit')
-
-        # State 3: Pump inlet (p_low, x=0) saturated liquid
-        self.state3 = steam(self.p_low, x=0, name='Pump Inlet')
-
-        # State 4: Pump exit (p_high, s=s_pump_inlet) typically sub-cooled, but estimate as saturated liquid
-        self.state4 = steam(self.p_high, s=self.state3.s, name='Pump Exit')
-        self.state4.h = self.state3.h + self.state3.v * (self.p_high - self.p_low)
-
-        # Calculate work and heat
-        self.turbine_work = self.state1.h - self.state2.h
-        self.pump_work = self.state4.h - self.state3.h
-        self.heat_added = self.state1.h - self.state4.h
-
-        # Calculate efficiency
-        self.efficiency = 100.0 * (self.turbine_work - self.pump_work) / self.heat_added
-        return self.efficiency
-
-    def print_summary(self):
-        '''
-        Print a summary of the Rankine cycle.
-        '''
-        if self.efficiency is None:
-            self.calc_efficiency()
-        print('Cycle Summary for: ', self.name)
-        print('\tEfficiency: {:0.3f}%'.format(self.efficiency))
-        print('\tTurbine Work: {:0.3f} kJ/kg'.format(self.turbine_work))
-        print('\tPump Work: {:0.3f} kJ/kg'.format(self.pump_work))
-        print('\tHeat Added: {:0.3f} kJ/kg'.format(self.heat_added))
-        self.state1.print()
-        self.state2.print()
-        self.state3.print()
+# rankine.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Steam import steam, steam_props, STEAM_DTYPE, REGION_UNDEFINED
+
+# one row of the result table of rankine_sweep, the specific quantities in kJ/kg and kJ/(kg K)
+SWEEP_DTYPE = np.dtype([('p_low', float),  # kPa
+                        ('p_high', float),  # kPa
+                        ('t_high', float),  # turbine inlet temperature in degrees C, nan for saturated vapor
+                        ('h1', float), ('s1', float),  # turbine inlet
+                        ('h2', float), ('x2', float),  # turbine exit
+                        ('h3', float), ('v3', float),  # pump inlet
+                        ('h4', float),  # pump exit
+                        ('turbine_work', float),
+                        ('pump_work', float),
+                        ('heat_added', float),
+                        ('efficiency', float)])  # percent, nan where a state is outside the steam tables
+
+
+def sweep_chunk(p_low, p_high, t_high):
+    '''
+    The Rankine cycles of a batch of operating points as whole array operations, following
+    rankine.calc_efficiency: every state of every cycle comes from one steam_props call per state.
+    :param p_low: 1-d array of low pressures in kPa
+    :param p_high: 1-d array of high pressures in kPa
+    :param t_high: 1-d array of turbine inlet temperatures in degrees C, nan for saturated vapor
+    :return: a structured array with dtype SWEEP_DTYPE, one row per operating point
+    '''
+    out = np.empty(len(p_low), dtype=SWEEP_DTYPE)
+    out['p_low'], out['p_high'], out['t_high'] = p_low, p_high, t_high
+
+    # State 1: Turbine inlet, saturated vapor where t_high is nan and superheated steam elsewhere
+    sat = np.isnan(t_high)
+    state1 = np.empty(len(p_low), dtype=STEAM_DTYPE)
+    state1[sat] = steam_props(p_high[sat], x=1.0)
+    state1[~sat] = steam_props(p_high[~sat], T=t_high[~sat])
+    state1['h'][state1['region'] == REGION_UNDEFINED] = np.nan  # e.g., t_high at or below saturation
+
+    # State 2: Turbine exit (p_low, s=s1), State 3: Pump inlet (p_low, x=0) saturated liquid
+    state2 = steam_props(p_low, s=state1['s'])
+    state3 = steam_props(p_low, x=0.0)
+
+    # State 4: Pump exit, incompressible liquid pumped from p_low to p_high
+    out['h1'], out['s1'] = state1['h'], state1['s']
+    out['h2'], out['x2'] = state2['h'], state2['x']
+    out['h3'], out['v3'] = state3['h'], state3['v']
+    out['h4'] = out['h3'] + out['v3'] * (p_high - p_low)
+
+    out['turbine_work'] = out['h1'] - out['h2']
+    out['pump_work'] = out['h4'] - out['h3']
+    out['heat_added'] = out['h1'] - out['h4']
+    out['efficiency'] = 100.0 * (out['turbine_work'] - out['pump_work']) / out['heat_added']
+    return out
+
+
+def rankine_sweep(p_low, p_high, t_high=None, grid=False, max_workers=1, chunk_size=100000):
+    '''
+    Parametric study of the Rankine cycle over many operating points at once.  Instead of building four steam
+    objects per cycle, each state of all the cycles is found in one vectorized steam_props call (see sweep_chunk).
+    Large sweeps can be split in chunks over a process pool; every task is three arrays, so no objects are pickled.
+    :param p_low: low pressure(s) in kPa
+    :param p_high: high pressure(s) in kPa
+    :param t_high: optional turbine inlet temperature(s) in degrees C; None or nan means saturated vapor
+    :param grid: False to broadcast the inputs against each other, True to sweep every combination of them
+    :param max_workers: number of worker processes (None for the number of cores); 0 or 1 computes in this process
+    :param chunk_size: number of operating points per task of the process pool
+    :return: a structured array with dtype SWEEP_DTYPE, one row per operating point in C order of the broadcast
+             (or grid) shape of the inputs
+    '''
+    inputs = [np.asarray(p_low, dtype=float), np.asarray(p_high, dtype=float),
+              np.asarray(np.nan if t_high is None else t_high, dtype=float)]
+    if grid:
+        inputs = np.meshgrid(*[a.ravel() for a in inputs], indexing='ij')
+    p_low, p_high, t_high = (a.ravel() for a in np.broadcast_arrays(*inputs))
+    n = len(p_low)
+    workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+    if workers <= 1 or n <= chunk_size:
+        return sweep_chunk(p_low, p_high, t_high)
+    split = np.arange(chunk_size, n, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = list(pool.map(sweep_chunk, np.split(p_low, split), np.split(p_high, split), np.split(t_high, split)))
+    return np.concatenate(chunks)
+
+
+class rankine:
+    def __init__(self, p_low=8, p_high=8000, t_high=None, name='Rankine Cycle'):
+        '''
+        Constructor for the Rankine cycle.
+        :param p_low: low pressure in kPa
+        :param p_high: high pressure in kPa
+        :param t_high: optional temperature for State 1 (turbine inlet) in degrees C
+        :param name: a convenient name
+        '''
+        self.p_low = p_low
+        self.p_high = p_high
+        self.t_high = t_high
+        self.name = name
+        self.efficiency = None
+        self.turbine_work = 0
+        self.pump_work = 0
+        self.heat_added = 0
+        self.state1 = None
+        self.state2 = None
+        self.state3 = None
+        self.state4 = None
+
+    def calc_efficiency(self):
+        '''
+        Calculate the efficiency of the Rankine cycle.
+        '''
+        # State 1: Turbine inlet (p_high, t_high) superheated or saturated vapor
+        if self.t_high is None:
+            self.state1 = steam(self.p_high, x=1, name='Turbine Inlet')  # saturated vapor
+        else:
+            self.state1 = steam(self.p_high, T=self.t_high, name='Turbine Inlet')  # superheated steam
+
+        # State 2: Turbine exit (p_low, s=s_turbine inlet) two-phase
+        self.state2 = steam(self.p_low, s=self.state1.s, name='Turbine Exit')
+
+        # State 3: Pump inlet (p_low, x=0) saturated liquid
+        self.state3 = steam(self.p_low, x=0, name='Pump Inlet')
+
+        # State 4: Pump exit (p_high, s=s_pump_inlet) typically sub-cooled, but estimate as saturated liquid
+        self.state4 = steam(self.p_high, s=self.state3.s, name='Pump Exit')
+        self.state4.h = self.state3.h + self.state3.v * (self.p_high - self.p_low)
+
+        # Calculate work and heat
+        self.turbine_work = self.state1.h - self.state2.h
+        self.pump_work = self.state4.h - self.state3.h
+        self.heat_added = self.state1.h - self.state4.h
+
+        # Calculate efficiency
+        self.efficiency = 100.0 * (self.turbine_work - self.pump_work) / self.heat_added
+        return self.efficiency
+
+    def print_summary(self):
+        '''
+        Print a summary of the Rankine cycle.
+        '''
+        if self.efficiency is None:
+            self.calc_efficiency()
+        print('Cycle Summary for: ', self.name)
+        print('\tEfficiency: {:0.3f}%'.format(self.efficiency))
+        print('\tTurbine Work: {:0.3f} kJ/kg'.format(self.turbine_work))
+        print('\tPump Work: {:0.3f} kJ/kg'.format(self.pump_work))
+        print('\tHeat Added: {:0.3f} kJ/kg'.format(self.heat_added))
+        self.state1.print()
+        self.state2.print()
+        self.state3.print()
         self.state4.print()
\ No newline at end of file
@@ -0,0 +1,202 @@
+# steam_tables.py
+import os
+import tempfile
+import threading
+import zipfile
+import numpy as np
+from scipy.interpolate import interp1d
+
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))  # the tables live next to this module
+SAT_FILE = 'sat_water_table.txt'
+SUPERHEATED_FILE = 'superheated_water_table.txt'
+CACHE_FILE = 'steam_tables.npz'
+CACHE_VERSION = 1  # bump when the layout of the binary cache changes
+
+_tables = None  # (sat, superheated) once loaded
+_interpolators = None  # see get_interpolators
+_lock = threading.Lock()
+
+
+def _stamp(paths):
+    '''
+    Identifies the text tables by size and modification time, so a stale binary cache is never used.
+    :param paths: the text table files
+    :return: an int64 array
+    '''
+    stamp = [CACHE_VERSION]
+    for path in paths:
+        st = os.stat(path)
+        stamp += [st.st_size, st.st_mtime_ns]
+    return np.array(stamp, dtype=np.int64)
+
+
+def save_cache(path, **arrays):
+    '''
+    Writes arrays to the .npz file path atomically: a temporary file in the same directory is written first and
+    then renamed over path, so processes starting together never read a half written cache.  Failures are ignored,
+    as the cache is optional, and the temporary file never outlives the call.
+    :param path: the .npz file
+    :param arrays: the arrays to save, by name
+    :return: nothing
+    '''
+    try:
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+    except OSError:
+        return  # e.g., a read only directory
+    replaced = False
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        # mkstemp makes the file private (0600), the cache gets the mode of any other new file
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+        replaced = True
+    except OSError:
+        pass
+    finally:
+        if not replaced:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def load_tables(table_dir=TABLE_DIR, use_cache=True):
+    '''
+    Reads the saturated and superheated steam tables from table_dir.  With use_cache, the tables are read from a
+    binary .npz copy next to the text files when it is up to date, so no text is parsed; otherwise the text is
+    parsed and the binary copy (re)written.  A missing or read only directory just skips the cache.
+    :param table_dir: directory of the table files
+    :param use_cache: True to read and write the binary cache
+    :return: a tuple (sat, superheated) of arrays laid out as np.loadtxt(..., unpack=True), i.e. one row per column
+             of the table: sat is (T degC, p bar, hf, hg, sf, sg, vf, vg) and superheated is (T degC, h, s, p kPa)
+    '''
+    paths = [os.path.join(table_dir, SAT_FILE), os.path.join(table_dir, SUPERHEATED_FILE)]
+    stamp = _stamp(paths)
+    cache = os.path.join(table_dir, CACHE_FILE)
+    if use_cache and os.path.exists(cache):
+        try:
+            with np.load(cache, allow_pickle=False) as cached:
+                if np.array_equal(cached['stamp'], stamp):
+                    return cached['sat'], cached['superheated']
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            pass  # unreadable cache, parse the text instead
+
+    sat = np.loadtxt(paths[0], unpack=True, skiprows=1)
+    superheated = np.loadtxt(paths[1], unpack=True, skiprows=1)
+    if use_cache:
+        save_cache(cache, stamp=stamp, sat=sat, superheated=superheated)
+    return sat, superheated
+
+
+def get_tables():
+    '''
+    The steam tables shared by every steam object in this process, loaded on first use (see load_tables).
+    :return: a tuple (sat, superheated) as returned by load_tables
+    '''
+    global _tables
+    if _tables is None:
+        with _lock:
+            if _tables is None:
+                _tables = load_tables()
+    return _tables
+
+
+class isobar_interpolator:
+    """
+    Interpolation of the superheated table along its isobars.  The table is a set of isobars, each tabulated on
+    increasing temperatures, and h and s increase with T along every isobar too.  So given the pressure and any one
+    of T, h or s, the given property is located by a bracketed binary search on each of the two isobars around the
+    pressure, the other columns are interpolated linearly in it there, and the two results are interpolated
+    linearly in pressure.  Unlike a triangulation of the scattered table points, this respects the structure of
+    the table: every table point is reproduced exactly, and the forward (T, p) and inverse (h, p) or (s, p)
+    lookups are consistent with each other to within the resolution of the table.  All the isobars are kept in one
+    array sorted by (isobar, property), so a single np.searchsorted handles any number of queries at once.
+    """
+    def __init__(self, p, y, columns):
+        '''
+        :param p: pressure column of the table in kPa
+        :param y: the column that is given in a lookup (T, h or s), increasing along every isobar
+        :param columns: a list of the columns to interpolate
+        '''
+        self.pressures = np.unique(p)  # sorted isobar pressures
+        iso = np.searchsorted(self.pressures, p)
+        order = np.lexsort((y, iso))  # by isobar, then y (stable, so ties from rounding keep the table order)
+        self.y = y[order]
+        self.columns = np.array([c[order] for c in columns])
+        counts = np.bincount(iso, minlength=len(self.pressures))
+        self.start = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        self.end = self.start + counts
+        # keys that sort every isobar into its own band: isobar index * span + (y - ymin)
+        self.ymin = self.y.min()
+        self.span = self.y.max() - self.ymin + 1.0
+        self.keys = iso[order] * self.span + (self.y - self.ymin)
+
+    def on_isobar(self, j, y):
+        '''
+        Interpolates the columns in y along isobar j, extrapolating linearly from the end segments.
+        :param j: int array of isobar indices
+        :param y: array of values of the given property
+        :return: an array with one row per column
+        '''
+        k = np.searchsorted(self.keys, j * self.span + (y - self.ymin))
+        k = np.clip(k, self.start[j] + 1, self.end[j] - 1)
+        dy = self.y[k] - self.y[k - 1]
+        frac = np.where(dy > 0, (y - self.y[k - 1]) / np.where(dy > 0, dy, 1.0), 0.0)  # ties from rounding
+        return self.columns[:, k - 1] + frac * (self.columns[:, k] - self.columns[:, k - 1])
+
+    def __call__(self, y, p):
+        '''
+        :param y: value(s) of the given property (T in degC, h in kJ/kg or s in kJ/(kg K))
+        :param p: pressure(s) in kPa
+        :return: an array of shape broadcast(y, p).shape + (number of columns,), nan outside the pressure range of
+                 the table or beyond the ends of both bracketing isobars
+        '''
+        y, p = np.broadcast_arrays(np.asarray(y, dtype=float), np.asarray(p, dtype=float))
+        i = np.clip(np.searchsorted(self.pressures, p, side='right') - 1, 0, len(self.pressures) - 2)
+        w = (p - self.pressures[i]) / (self.pressures[i + 1] - self.pressures[i])
+        lo = np.minimum(self.y[self.start[i]], self.y[self.start[i + 1]])
+        hi = np.maximum(self.y[self.end[i] - 1], self.y[self.end[i + 1] - 1])
+        valid = (p >= self.pressures[0]) & (p <= self.pressures[-1]) & (y >= lo) & (y <= hi)
+        out = np.moveaxis((1 - w) * self.on_isobar(i, y) + w * self.on_isobar(i + 1, y), 0, -1)
+        out[~valid] = np.nan
+        return out
+
+
+def build_interpolators(sat, superheated):
+    '''
+    Builds every interpolant of the steam tables once, instead of one scipy griddata call (and Delaunay
+    triangulation of the whole table) per property per lookup.  The saturated properties are piecewise linear in
+    pressure, all seven columns in one interp1d, and the superheated lookups interpolate along the isobars of the
+    table (see isobar_interpolator).  Lookups outside the tables give nan.
+    :param sat: the saturated table as returned by load_tables
+    :param superheated: the superheated table as returned by load_tables
+    :return: a dictionary of interpolators:
+             'sat': p (bar) -> (Tsat, hf, hg, sf, sg, vf, vg)
+             'Tp': (T (degC), p (kPa)) -> (h, s) of superheated steam
+             'hp': (h, p (kPa)) -> (T, s) of superheated steam
+             'sp': (s, p (kPa)) -> (T, h) of superheated steam
+    '''
+    ts, ps, hfs, hgs, sfs, sgs, vfs, vgs = sat
+    tcol, hcol, scol, pcol = superheated
+    return {'sat': interp1d(ps, np.array([ts, hfs, hgs, sfs, sgs, vfs, vgs]), axis=1, assume_sorted=True,
+                            bounds_error=False, fill_value=np.nan),
+            'Tp': isobar_interpolator(pcol, tcol, [hcol, scol]),
+            'hp': isobar_interpolator(pcol, hcol, [tcol, scol]),
+            'sp': isobar_interpolator(pcol, scol, [tcol, hcol])}
+
+
+def get_interpolators():
+    '''
+    The interpolators shared by every steam object in this process, built on first use (see build_interpolators).
+    :return: the dictionary of interpolators
+    '''
+    global _interpolators
+    if _interpolators is None:
+        sat, superheated = get_tables()
+        with _lock:
+            if _interpolators is None:
+                _interpolators = build_interpolators(sat, superheated)
+    return _interpolators
@@ -1,16 +1,27 @@
-# test_rankine.py
-from rankine import rankine
-
-def main():
-    # Case 1: Saturated vapor entering the turbine
-    rankine1 = rankine(p_low=8, p_high=8000, name='Rankine Cycle - Saturated Vapor')
-    eff1 = rankine1.calc_efficiency()
-    rankine1.print_summary()
-
-    # Case 2: Superheated steam entering the turbine
-    rankine2 = rankine(p_low=8, p_high=8000, t_high=500, name='Rankine Cycle - Superheated Steam')
-    eff2 = rankine2.calc_efficiency()
-    rankine2.print_summary()
-
-if __name__ == "__main__":
+# test_rankine.py
+import math
+from rankine import rankine, rankine_sweep
+
+def main():
+    # Case 1: Saturated vapor entering the turbine
+    rankine1 = rankine(p_low=8, p_high=8000, name='Rankine Cycle - Saturated Vapor')
+    eff1 = rankine1.calc_efficiency()
+    rankine1.print_summary()
+
+    # Case 2: Superheated steam entering the turbine
+    rankine2 = rankine(p_low=8, p_high=8000, t_high=500, name='Rankine Cycle - Superheated Steam')
+    eff2 = rankine2.calc_efficiency()
+    rankine2.print_summary()
+
+    # Case 3: Sweep of the turbine inlet temperature, both cases above included
+    sweep = rankine_sweep(p_low=8, p_high=8000, t_high=[float('nan'), 400, 450, 500, 550, 600])
+    print('Rankine Cycle Sweep (p_low=8 kPa, p_high=8000 kPa)')
+    for row in sweep:
+        print('\tt_high: {:0.1f} C\tEfficiency: {:0.3f}%'.format(row['t_high'], row['efficiency']))
+
+    # the sweep must reproduce the cycles computed one at a time
+    assert math.isclose(sweep['efficiency'][0], eff1, rel_tol=1e-10), 'sweep differs for saturated vapor'
+    assert math.isclose(sweep['efficiency'][3], eff2, rel_tol=1e-10), 'sweep differs for superheated steam'
+
+if __name__ == "__main__":
     main()
\ No newline at end of file